@@ -1,10 +1,20 @@
 from django.urls import path
 
+from core.prerender import static_page
+
 from . import views
 
 app_name = 'about'
 
 urlpatterns = [
-    path('author/', views.AboutAuthorView.as_view(), name='author'),
-    path('tech/', views.AboutTechView.as_view(), name='tech'),
+    path(
+        'author/',
+        static_page(views.AboutAuthorView.as_view()),
+        name='author'
+    ),
+    path(
+        'tech/',
+        static_page(views.AboutTechView.as_view()),
+        name='tech'
+    ),
 ]
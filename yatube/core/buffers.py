@@ -0,0 +1,95 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Копит записи в памяти процесса и сбрасывает их одной пачкой.
+
+    Сброс происходит при накоплении `threshold` записей, при первом
+    добавлении после `interval` секунд или, если включён `background`,
+    по таймеру — тогда задержка записи ограничена `interval` даже
+    без трафика.
+
+    Сброс из add() и по таймеру идёт внутри чужого запроса или потока,
+    поэтому его ошибка только пишется в лог: записи остаются в буфере
+    до следующей попытки. Явный вызов flush() ошибку пробрасывает.
+    """
+
+    def __init__(self, flush_func, threshold=100, interval=10,
+                 background=False):
+        self.flush_func = flush_func
+        self.threshold = threshold
+        self.interval = interval
+        self.background = background
+        self._lock = threading.Lock()
+        self._items = []
+        self._flushed_at = time.monotonic()
+        self._timer = None
+        if background:
+            atexit.register(self.flush)
+
+    def add(self, item):
+        with self._lock:
+            self._items.append(item)
+            due = (
+                len(self._items) >= self.threshold
+                or time.monotonic() - self._flushed_at >= self.interval
+            )
+            if not due and self.background and self._timer is None:
+                self._timer = threading.Timer(
+                    self.interval, self._flush_in_background
+                )
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self._flush_quietly()
+
+    def pending(self):
+        """Возвращает копию ещё не сброшенных записей."""
+        with self._lock:
+            return list(self._items)
+
+    def flush(self):
+        with self._lock:
+            items, self._items = self._items, []
+            self._flushed_at = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not items:
+            return
+        try:
+            self.flush_func(items)
+        except Exception:
+            # Возвращаем записи в буфер, чтобы не потерять их при сбое.
+            with self._lock:
+                self._items[:0] = items
+            raise
+
+    def clear(self):
+        """Отбрасывает несброшенные записи и заново отсчитывает интервал."""
+        with self._lock:
+            self._items = []
+            self._flushed_at = time.monotonic()
+
+    def _flush_quietly(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(
+                'Не удалось сбросить буфер %s, записей в очереди: %d',
+                self.flush_func.__name__, len(self._items)
+            )
+
+    def _flush_in_background(self):
+        try:
+            self._flush_quietly()
+        finally:
+            connections.close_all()
@@ -0,0 +1,43 @@
+"""Ленивые контекст-процессоры.
+
+Шаблон вызывает значение контекста, если оно вызываемое, поэтому
+ленивое значение — это функция без аргументов. Она считается, только
+когда шаблон её прочитал; фрагменты и страницы ошибок, которым
+значение не нужно, ничего не платят. Обёртки вроде SimpleLazyObject
+здесь не годятся: их создание на каждый рендер дороже самих значений.
+
+process_cached хранит значение в памяти процесса до указанного срока.
+"""
+import time
+from functools import partial, wraps
+
+
+def lazy_processor(**factories):
+    """Собирает процессор из функций вида factory(request)."""
+    def processor(request):
+        return {
+            name: partial(factory, request)
+            for name, factory in factories.items()
+        }
+    return processor
+
+
+def process_cached(expires_at):
+    """Кэширует результат в процессе до метки времени expires_at(value)."""
+    def decorator(func):
+        state = [None, 0.0]
+
+        @wraps(func)
+        def wrapper():
+            value, expires = state
+            if time.time() >= expires:
+                value = func()
+                state[:] = value, expires_at(value)
+            return value
+
+        def cache_clear():
+            state[:] = None, 0.0
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
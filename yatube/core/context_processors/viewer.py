@@ -0,0 +1,46 @@
+from django.utils.functional import cached_property
+
+from .lazy import lazy_processor
+
+
+class Viewer:
+    """Права текущего пользователя, посчитанные один раз за запрос.
+
+    Подписки читаются одним запросом при первом обращении, поэтому
+    проверки в цикле по постам не обращаются к базе.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def user_id(self):
+        return self.user.pk if self.user.is_authenticated else None
+
+    @cached_property
+    def followed_ids(self):
+        if self.user_id is None:
+            return frozenset()
+        return frozenset(
+            self.user.follower.values_list('author_id', flat=True)
+        )
+
+    def can_edit(self, post):
+        return self.user_id is not None and post.author_id == self.user_id
+
+    def follows(self, author):
+        return author.pk in self.followed_ids
+
+    def can_follow(self, author):
+        return self.user_id != author.pk
+
+
+def get_viewer(request):
+    """Viewer запроса, общий для представления и шаблонов."""
+    if not hasattr(request, '_viewer'):
+        request._viewer = Viewer(request.user)
+    return request._viewer
+
+
+viewer = lazy_processor(viewer=get_viewer)
+viewer.__doc__ = 'Добавляет права текущего пользователя.'
@@ -1,9 +1,28 @@
+from datetime import datetime
+
+from django.conf import settings
 from django.utils import timezone
 
+from .lazy import process_cached
+
+
+def _year_end(year):
+    end = datetime(year + 1, 1, 1)
+    if settings.USE_TZ:
+        end = end.replace(tzinfo=timezone.utc)
+    return end.timestamp()
+
+
+@process_cached(expires_at=_year_end)
+def current_year():
+    """Текущий год, пересчитывается только после его смены."""
+    return timezone.now().year
+
 
 def year(request):
-    current_year = timezone.now().year
-    """Добавляет переменную с текущим годом."""
-    return {
-        'year': current_year,
-    }
+    """Добавляет переменную с текущим годом.
+
+    Значение общее для процесса и от запроса не зависит, поэтому
+    в контекст кладётся сама функция: шаблон вызовет её при чтении.
+    """
+    return {'year': current_year}
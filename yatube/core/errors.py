@@ -0,0 +1,76 @@
+"""Дешёвые страницы ошибок для анонимных запросов.
+
+Боты перебирают случайные адреса, и полный рендер страницы ошибки
+через base.html с шапкой, контекст-процессорами и пользователем
+стоит столько же, сколько настоящая страница. Запросу без cookie
+сессии в режиме ERROR_PAGES_PRERENDERED отдаётся страница,
+отрендеренная один раз на процесс для анонима.
+
+Адреса 404 считаются в буфере процесса и пачками сливаются в общий
+кэш, где хранятся только ERROR_TRACKED_PATHS самых частых.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.template.loader import render_to_string
+
+from .buffers import WriteBehindBuffer
+from .context_processors.year import current_year
+from .locks import cache_lock
+
+
+MISSING_PATHS_KEY = 'not-found:paths'
+MISSING_PATHS_LOCK_KEY = 'not-found:paths:lock'
+MAX_PATH_LENGTH = 200
+
+_prerendered = {}
+
+
+def is_anonymous(request):
+    """Аноним без сессии: пользователя не нужно читать из базы."""
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def prerendered(template_name):
+    """Страница для анонима, общая для всех запросов процесса.
+
+    В подвале стоит год, поэтому в ключе он тоже есть.
+    """
+    key = (template_name, current_year())
+    if key not in _prerendered:
+        request = HttpRequest()
+        request.user = AnonymousUser()
+        _prerendered[key] = render_to_string(template_name, request=request)
+    return _prerendered[key]
+
+
+def flush_missing_paths(paths):
+    # Без блокировки сбросы разных воркеров перезаписывают счётчики
+    # друг друга.
+    with cache_lock(MISSING_PATHS_LOCK_KEY):
+        counts = Counter(cache.get(MISSING_PATHS_KEY, {}))
+        counts.update(paths)
+        cache.set(
+            MISSING_PATHS_KEY,
+            dict(counts.most_common(settings.ERROR_TRACKED_PATHS)),
+            None
+        )
+
+
+missing_paths_buffer = WriteBehindBuffer(
+    flush_missing_paths,
+    interval=settings.ERROR_STATS_FLUSH_INTERVAL,
+    background=settings.ERROR_STATS_BACKGROUND_FLUSH,
+)
+
+
+def record_missing(path):
+    missing_paths_buffer.add(path[:MAX_PATH_LENGTH])
+
+
+def top_missing_paths(limit=20):
+    """Самые частые адреса 404 с числом запросов."""
+    return Counter(cache.get(MISSING_PATHS_KEY, {})).most_common(limit)
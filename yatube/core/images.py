@@ -0,0 +1,213 @@
+"""Уменьшенные копии картинок по подписанным адресам.
+
+Адрес /img/<подпись>/<ширина>x<высота>/<формат>/<имя файла> строит
+image_url. Подпись не даёт перебирать размеры и форматы. Копия строится
+в пуле из IMAGE_WORKERS потоков и сохраняется на диск под хэшем
+содержимого исходника, поэтому повторный запрос — это чтение файла.
+Когда кэш превышает IMAGE_CACHE_MAX_SIZE, удаляются давно не
+использованные копии.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare, salted_hmac
+from PIL import Image, ImageOps
+
+
+FORMATS = {
+    'jpeg': ('JPEG', 'image/jpeg'),
+    'webp': ('WEBP', 'image/webp'),
+    'avif': ('AVIF', 'image/avif'),
+}
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 85, 'optimize': True, 'progressive': True},
+    'WEBP': {'quality': 80},
+    'AVIF': {'quality': 60},
+}
+MAX_DIMENSION = 2560
+SIGNATURE_LENGTH = 16
+DIGEST_TIMEOUT = 60 * 60 * 24
+# После вытеснения в кэше остаётся столько от предела
+EVICT_TO = 0.9
+
+
+class ImageBusy(Exception):
+    """Все воркеры заняты, копию стоит запросить позже."""
+
+
+def supported_formats():
+    Image.init()
+    return [
+        extension for extension, (image_format, _) in FORMATS.items()
+        if image_format in Image.SAVE
+    ]
+
+
+def sign(name, width, height, extension):
+    return salted_hmac(
+        'core.images', f'{name}:{width}x{height}:{extension}'
+    ).hexdigest()[:SIGNATURE_LENGTH]
+
+
+def image_url(name, width, height, extension='jpeg'):
+    return reverse('resized_image', kwargs={
+        'signature': sign(name, width, height, extension),
+        'width': width,
+        'height': height,
+        'extension': extension,
+        'name': name,
+    })
+
+
+def verify(signature, name, width, height, extension):
+    return (
+        extension in FORMATS
+        and 0 < width <= MAX_DIMENSION
+        and 0 < height <= MAX_DIMENSION
+        and constant_time_compare(
+            signature, sign(name, width, height, extension)
+        )
+    )
+
+
+def source_digest(name):
+    """Хэш содержимого исходной картинки, считается один раз."""
+    key = f'image-digest:{name}'
+    digest = cache.get(key)
+    if digest is None:
+        with default_storage.open(name) as source:
+            digest = hashlib.sha256(source.read()).hexdigest()
+        cache.set(key, digest, DIGEST_TIMEOUT)
+    return digest
+
+
+def resize(name, width, height, extension):
+    image_format = FORMATS[extension][0]
+    with default_storage.open(name) as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image = ImageOps.fit(image, (width, height), Image.LANCZOS)
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    output = BytesIO()
+    image.save(output, image_format, **SAVE_OPTIONS[image_format])
+    return output.getvalue()
+
+
+class DiskCache:
+    """Файлы копий на диске с вытеснением давно не читанных."""
+
+    def __init__(self, root, max_size):
+        self.root = root
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._size = None
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            # Время изменения служит меткой последнего чтения.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def set(self, key, content):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(descriptor, 'wb') as target:
+            target.write(content)
+        os.replace(temp_path, path)
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(content)
+            if self._size > self.max_size:
+                self._evict()
+        return path
+
+    def _files(self):
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._files())
+
+    def _evict(self):
+        files = sorted(self._files())
+        self._size = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if self._size <= self.max_size * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+
+class Resizer:
+    """Пул воркеров: одна копия строится один раз, даже при гонке."""
+
+    def __init__(self, workers, max_pending):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='image-resize'
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # Колбэк готовой задачи может выполниться прямо в build.
+        self._lock = threading.RLock()
+        self._futures = {}
+
+    def build(self, key, func, *args):
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                if not self._slots.acquire(blocking=False):
+                    raise ImageBusy
+                future = self._executor.submit(func, *args)
+                self._futures[key] = future
+                future.add_done_callback(lambda _: self._release(key))
+        return future.result(timeout=settings.IMAGE_RESIZE_TIMEOUT)
+
+    def _release(self, key):
+        with self._lock:
+            self._futures.pop(key, None)
+        self._slots.release()
+
+
+disk_cache = DiskCache(
+    settings.IMAGE_CACHE_ROOT, settings.IMAGE_CACHE_MAX_SIZE
+)
+resizer = Resizer(settings.IMAGE_WORKERS, settings.IMAGE_MAX_PENDING)
+
+
+def _build(key, name, width, height, extension):
+    return disk_cache.set(key, resize(name, width, height, extension))
+
+
+def resized_path(name, width, height, extension):
+    """Путь к готовой копии на диске, при необходимости строит её."""
+    key = f'{source_digest(name)}-{width}x{height}.{extension}'
+    path = disk_cache.get(key)
+    if path is None:
+        path = resizer.build(key, _build, key, name, width, height, extension)
+    return path
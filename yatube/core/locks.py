@@ -0,0 +1,31 @@
+"""Блокировка через общий кэш для коротких read-modify-write.
+
+cache.add атомарен в memcached, redis и LocMemCache, поэтому ключ
+занимает только один процесс. Ключ живёт `timeout` секунд: если
+владелец упал, блокировка освободится сама, и ждать дольше не нужно.
+"""
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+
+LOCK_POLL_INTERVAL = 0.01
+
+
+@contextmanager
+def cache_lock(key, timeout=5):
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + timeout
+    while not cache.add(key, token, timeout):
+        if time.monotonic() >= deadline:
+            # Владелец не отпустил ключ за время его жизни: он упал.
+            cache.set(key, token, timeout)
+            break
+        time.sleep(LOCK_POLL_INTERVAL)
+    try:
+        yield
+    finally:
+        if cache.get(key) == token:
+            cache.delete(key)
@@ -0,0 +1,116 @@
+"""Очередь исходящей почты.
+
+QueuedEmailBackend только сохраняет письма в базу, поэтому запрос
+не ждёт почтовый сервер. Воркеры забирают письма пачками, отправляют
+каждую пачку через одно соединение EMAIL_DELIVERY_BACKEND и при
+ошибках откладывают повтор с экспоненциально растущей паузой.
+"""
+import pickle
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connections
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(minutes=1)
+# Сколько письмо остаётся за воркером, прежде чем его заберёт другой.
+LEASE_DURATION = timedelta(minutes=10)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        OutgoingEmail.objects.bulk_create([
+            OutgoingEmail(message=pickle.dumps(message))
+            for message in email_messages
+        ])
+        return len(email_messages)
+
+
+def claim_batch(batch_size=BATCH_SIZE):
+    """Закрепляет за воркером пачку писем, готовых к отправке."""
+    now = timezone.now()
+    lease = uuid.uuid4().hex
+    ready = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.PENDING,
+        next_attempt_at__lte=now,
+    )
+    ids = list(
+        ready.order_by('next_attempt_at').values_list('id', flat=True)
+        [:batch_size]
+    )
+    ready.filter(id__in=ids).update(
+        lease=lease,
+        next_attempt_at=now + LEASE_DURATION,
+    )
+    return list(OutgoingEmail.objects.filter(lease=lease))
+
+
+def _retry_later(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= MAX_ATTEMPTS:
+        email.status = OutgoingEmail.FAILED
+    else:
+        email.next_attempt_at = (
+            timezone.now() + RETRY_DELAY * 2 ** (email.attempts - 1)
+        )
+
+
+def deliver_batch(batch_size=BATCH_SIZE):
+    """Отправляет одну пачку писем и возвращает её размер."""
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0
+    connection = get_connection(
+        settings.EMAIL_DELIVERY_BACKEND, fail_silently=False
+    )
+    processed = set()
+    try:
+        with connection:
+            for email in emails:
+                try:
+                    connection.send_messages([pickle.loads(email.message)])
+                except Exception as error:
+                    _retry_later(email, error)
+                else:
+                    email.status = OutgoingEmail.SENT
+                processed.add(email.id)
+    except Exception as error:
+        # Соединение с сервером не удалось: повторяем оставшиеся письма.
+        for email in emails:
+            if email.id not in processed:
+                _retry_later(email, error)
+    OutgoingEmail.objects.bulk_update(
+        emails,
+        ['status', 'attempts', 'next_attempt_at', 'last_error'],
+    )
+    return len(emails)
+
+
+def _deliver_until_empty(batch_size):
+    delivered = 0
+    try:
+        while True:
+            count = deliver_batch(batch_size)
+            if not count:
+                return delivered
+            delivered += count
+    finally:
+        connections.close_all()
+
+
+def deliver_queued_emails(workers=4, batch_size=BATCH_SIZE):
+    """Разбирает очередь пулом воркеров, пока она не опустеет."""
+    with ThreadPoolExecutor(workers) as executor:
+        return sum(executor.map(
+            _deliver_until_empty, [batch_size] * workers
+        ))
@@ -0,0 +1,76 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import Engine, RequestContext, Variable, engines
+from django.test import RequestFactory
+from django.utils import timezone
+
+from core.context_processors.viewer import Viewer
+
+# Процессоры в том виде, в каком они были до перехода на ленивые.
+BASELINE_PROCESSORS = [
+    'django.template.context_processors.debug',
+    'django.template.context_processors.request',
+    'django.contrib.auth.context_processors.auth',
+    'django.contrib.messages.context_processors.messages',
+    'core.management.commands.benchmark_context.eager_year',
+    'core.management.commands.benchmark_context.eager_viewer',
+]
+# Какие переменные контекста читают типичные шаблоны.
+SCENARIOS = {
+    'фрагмент': [],
+    'подвал': ['year'],
+    'лента': ['year', 'user.is_authenticated', 'viewer.user_id'],
+}
+
+
+def eager_year(request):
+    return {'year': timezone.now().year}
+
+
+def eager_viewer(request):
+    return {'viewer': Viewer(request.user)}
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет накладные расходы контекст-процессоров на один рендер: '
+        'прежний набор против текущих настроек. Время включает запуск '
+        'процессоров и чтение переменных, которые нужны шаблону.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renders', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        current = engines['django'].engine
+        variants = {
+            'было': Engine(context_processors=BASELINE_PROCESSORS),
+            'стало': current,
+        }
+        for title, names in SCENARIOS.items():
+            timings = ', '.join(
+                f'{name} {self.measure(engine, names, options):.2f} мкс'
+                for name, engine in variants.items()
+            )
+            self.stdout.write(f'{title.capitalize()}: {timings}')
+
+    def measure(self, engine, names, options):
+        """Лучшее из повторов среднее время на рендер в микросекундах."""
+        template = engine.from_string('')
+        variables = [Variable(name) for name in names]
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        renders = options['renders']
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            for _ in range(renders):
+                context = RequestContext(request)
+                with context.bind_template(template):
+                    for variable in variables:
+                        variable.resolve(context)
+            timings.append((time.perf_counter() - started) / renders)
+        return min(timings) * 1e6
@@ -0,0 +1,73 @@
+import copy
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, reset_queries
+from django.test import Client
+from django.test.utils import override_settings
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает страницы параллельными запросами через WSGI-обработчик '
+        'и печатает пропускную способность, задержки и число SQL-запросов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+')
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--username')
+
+    def handle(self, *args, **options):
+        for url in options['urls']:
+            self.stdout.write(self.benchmark(url, options))
+
+    def make_client(self, username):
+        client = Client()
+        if username:
+            from django.contrib.auth import get_user_model
+            client.force_login(
+                get_user_model().objects.get(username=username)
+            )
+        return client
+
+    def count_queries(self, client, url):
+        with override_settings(DEBUG=True):
+            reset_queries()
+            client.get(url)
+            return len(connection.queries)
+
+    def benchmark(self, url, options):
+        client = self.make_client(options['username'])
+        queries = self.count_queries(client, url)
+        local = threading.local()
+
+        def timed_request(_):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+                local.client.cookies = copy.deepcopy(client.cookies)
+            started = time.perf_counter()
+            response = local.client.get(url)
+            elapsed = time.perf_counter() - started
+            connections.close_all()
+            return response.status_code, elapsed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            results = list(executor.map(
+                timed_request, range(options['requests'])
+            ))
+        total = time.perf_counter() - started
+        latencies = sorted(elapsed for _, elapsed in results)
+        errors = sum(1 for status, _ in results if status >= 500)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return (
+            f'{url}: {len(results) / total:.1f} запр/с, '
+            f'медиана {statistics.median(latencies) * 1000:.1f} мс, '
+            f'p95 {p95 * 1000:.1f} мс, '
+            f'SQL-запросов {queries}, ошибок {errors}'
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.errors import missing_paths_buffer, top_missing_paths
+
+
+class Command(BaseCommand):
+    help = 'Показывает адреса, по которым чаще всего отвечали 404.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, *args, **options):
+        missing_paths_buffer.flush()
+        for path, count in top_missing_paths(options['limit']):
+            self.stdout.write(f'{count}\t{path}')
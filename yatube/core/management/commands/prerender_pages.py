@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.prerender import PrerenderError, prerender_pages
+
+
+class Command(BaseCommand):
+    help = (
+        'Рендерит страницы, помеченные static_page, в PRERENDER_ROOT. '
+        'Запускается при выкладке, после collectstatic.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--root')
+
+    def handle(self, *args, **options):
+        try:
+            manifest = prerender_pages(options['root'])
+        except PrerenderError as error:
+            raise CommandError(error)
+        for path, entry in manifest.items():
+            self.stdout.write(f'{path} -> {entry["file"]} {entry["etag"]}')
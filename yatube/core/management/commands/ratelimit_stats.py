@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.ratelimit import rejection_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает число запросов, отклонённых ограничением частоты.'
+
+    def handle(self, *args, **options):
+        for name, count in rejection_stats().items():
+            self.stdout.write(f'{name}: {count}')
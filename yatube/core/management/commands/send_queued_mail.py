@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.mail import BATCH_SIZE, deliver_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди пулом воркеров.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Повторять разбор очереди каждые N секунд.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            delivered = deliver_queued_emails(
+                options['workers'], options['batch_size']
+            )
+            self.stdout.write(f'Обработано писем: {delivered}')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class CreatedModel(models.Model):
@@ -10,3 +11,31 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class OutgoingEmail(CreatedModel):
+    """Письмо в очереди на отправку."""
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не доставлено'),
+    )
+
+    message = models.BinaryField('Письмо')
+    status = models.CharField(
+        'Статус',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now,
+        db_index=True
+    )
+    lease = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
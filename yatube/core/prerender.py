@@ -0,0 +1,143 @@
+"""Страницы, отрендеренные заранее при выкладке.
+
+Представление без параметров помечается static_page в urls.py.
+Команда prerender_pages рендерит все помеченные адреса от имени
+анонима в PRERENDER_ROOT и пишет манифест с ETag по хэшу содержимого.
+
+PrerenderedPagesApplication отдаёт эти страницы на уровне WSGI, до
+Django, но только запросам без cookie сессии: у вошедшего
+пользователя своя шапка, и страница для него рендерится как обычно.
+"""
+import hashlib
+import json
+import os
+from wsgiref.headers import Headers
+
+from django.conf import settings
+from django.http import parse_cookie
+from django.urls import URLResolver, get_resolver
+from django.urls.resolvers import RoutePattern
+
+from .static import DEFAULT_CACHE_CONTROL
+
+
+MANIFEST_NAME = 'pages.json'
+
+
+class PrerenderError(Exception):
+    """Страницу нельзя отдавать всем анонимам одинаковой."""
+
+
+def static_page(view):
+    """Помечает представление для prerender_pages."""
+    view.prerender = True
+    return view
+
+
+def static_paths(patterns=None, prefix='/'):
+    """Адреса помеченных представлений, у которых нет параметров."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if not isinstance(pattern.pattern, RoutePattern):
+            continue
+        if pattern.pattern.converters:
+            continue
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from static_paths(pattern.url_patterns, route)
+        elif getattr(pattern.callback, 'prerender', False):
+            yield route
+
+
+def page_filename(path):
+    return os.path.join(path.strip('/'), 'index.html').lstrip('/')
+
+
+def prerender_pages(root=None):
+    """Рендерит помеченные страницы в root и возвращает манифест."""
+    # Тестовый клиент нужен только при сборке, не в рабочем процессе.
+    from django.test import Client
+
+    root = root or settings.PRERENDER_ROOT
+    client = Client()
+    manifest = {}
+    for path in static_paths():
+        response = client.get(path)
+        if response.status_code != 200 or response.cookies:
+            raise PrerenderError(
+                f'{path}: код {response.status_code}, '
+                f'cookies {sorted(response.cookies)}'
+            )
+        filename = page_filename(path)
+        os.makedirs(os.path.join(root, os.path.dirname(filename)),
+                    exist_ok=True)
+        with open(os.path.join(root, filename), 'wb') as page:
+            page.write(response.content)
+        manifest[path] = {
+            'file': filename,
+            'etag': f'"{hashlib.md5(response.content).hexdigest()}"',
+            'content_type': response['Content-Type'],
+        }
+    # Манифест подменяется целиком, чтобы его не прочитали недописанным.
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    with open(manifest_path + '.tmp', 'w') as manifest_file:
+        json.dump(manifest, manifest_file, ensure_ascii=False, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+class PrerenderedPage:
+    def __init__(self, root, entry):
+        with open(os.path.join(root, entry['file']), 'rb') as page:
+            self.content = page.read()
+        self.etag = entry['etag']
+        self.content_type = entry['content_type']
+
+
+class PrerenderedPagesApplication:
+    """Оборачивает WSGI-приложение и отдаёт готовые страницы анонимам."""
+
+    def __init__(self, application, root=None):
+        self.application = application
+        self.root = root or settings.PRERENDER_ROOT
+        self.pages = self.load()
+
+    def load(self):
+        manifest_path = os.path.join(self.root, MANIFEST_NAME)
+        if not os.path.isfile(manifest_path):
+            return {}
+        with open(manifest_path) as manifest:
+            return {
+                path: PrerenderedPage(self.root, entry)
+                for path, entry in json.load(manifest).items()
+            }
+
+    def __call__(self, environ, start_response):
+        page = self.pages.get(environ.get('PATH_INFO', ''))
+        if (
+            page is None
+            or environ['REQUEST_METHOD'] not in ('GET', 'HEAD')
+            or environ.get('QUERY_STRING')
+            or settings.SESSION_COOKIE_NAME in parse_cookie(
+                environ.get('HTTP_COOKIE', '')
+            )
+        ):
+            return self.application(environ, start_response)
+        return self.serve(page, environ, start_response)
+
+    def serve(self, page, environ, start_response):
+        headers = Headers([
+            ('Cache-Control', DEFAULT_CACHE_CONTROL),
+            ('ETag', page.etag),
+            ('Vary', 'Cookie'),
+        ])
+        if environ.get('HTTP_IF_NONE_MATCH') == page.etag:
+            start_response('304 Not Modified', headers.items())
+            return []
+        headers['Content-Type'] = page.content_type
+        headers['Content-Length'] = str(len(page.content))
+        start_response('200 OK', headers.items())
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        return [page.content]
@@ -0,0 +1,146 @@
+"""Проверка числа SQL-запросов на страницах.
+
+QueryBudgetMixin обходит все маршруты заданных URLconf-модулей при
+двух объёмах данных. Тест падает, если число запросов страницы растёт
+вместе с данными (N+1) или превышает заявленный бюджет, и печатает
+запросы с местами в коде проекта, откуда они выполнены.
+"""
+import os
+import traceback
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.urls import URLPattern, URLResolver, reverse
+from django.utils.module_loading import import_module
+
+
+ORIGIN_DEPTH = 3
+
+
+class QueryLog:
+    """Записывает выполненные запросы вместе с местом вызова."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, self.origin()))
+        return execute(sql, params, many, context)
+
+    @staticmethod
+    def origin():
+        frames = [
+            frame for frame in traceback.extract_stack()
+            if frame.filename.startswith(settings.BASE_DIR)
+            and f'{os.sep}tests{os.sep}' not in frame.filename
+            and frame.filename != __file__
+        ]
+        return [
+            f'{os.path.relpath(frame.filename, settings.BASE_DIR)}:'
+            f'{frame.lineno} in {frame.name}'
+            for frame in frames[-ORIGIN_DEPTH:]
+        ]
+
+    def __len__(self):
+        return len(self.queries)
+
+    def report(self):
+        lines = []
+        for number, (sql, origin) in enumerate(self.queries, 1):
+            lines.append(f'{number}. {sql}')
+            lines.extend(f'     {place}' for place in origin)
+        return '\n'.join(lines)
+
+
+def measure(client, url):
+    """Запрашивает страницу и возвращает журнал её запросов."""
+    log = QueryLog()
+    with connection.execute_wrapper(log):
+        client.get(url)
+    return log
+
+
+def iter_routes(urlconf):
+    """Имена маршрутов URLconf-модуля и имена их параметров."""
+    module = import_module(urlconf)
+    namespace = getattr(module, 'app_name', None)
+    for pattern in module.urlpatterns:
+        if isinstance(pattern, URLResolver) or not isinstance(
+            pattern, URLPattern
+        ) or not pattern.name:
+            continue
+        name = f'{namespace}:{pattern.name}' if namespace else pattern.name
+        yield name, sorted(pattern.pattern.converters)
+
+
+class QueryBudgetMixin:
+    """Проверяет число запросов на всех страницах URLconf-модулей.
+
+    Тестовый класс задаёт load_data(scale), которая создаёт данные
+    нужного объёма и возвращает параметры маршрутов, например
+    {'username': ..., 'post_id': ...}. Страница не должна выполнять
+    больше query_budgets[name] (или default_query_budget) запросов.
+    """
+    budget_urlconfs = ()
+    scales = (1, 5)
+    default_query_budget = 10
+    query_budgets = {}
+
+    def load_data(self, scale):
+        """Создаёт данные объёма scale и возвращает параметры маршрутов.
+
+        Обязательный хук: без него проверка падает с понятным сообщением.
+        """
+        self.fail(
+            f'{type(self).__name__} должен определить load_data(scale), '
+            'возвращающую параметры маршрутов'
+        )
+
+    def prepare_client(self, client):
+        """Готовит клиента перед каждым запросом."""
+        cache.clear()
+
+    def routes(self, kwargs):
+        for urlconf in self.budget_urlconfs:
+            for name, params in iter_routes(urlconf):
+                missing = set(params) - set(kwargs)
+                self.assertFalse(
+                    missing,
+                    f'{name}: нет значений для параметров {sorted(missing)}'
+                )
+                yield name, reverse(
+                    name, kwargs={param: kwargs[param] for param in params}
+                )
+
+    def measure_routes(self, scale):
+        measured = {}
+        with transaction.atomic():
+            kwargs = self.load_data(scale)
+            for name, url in self.routes(kwargs):
+                self.prepare_client(self.client)
+                measured[name] = (url, measure(self.client, url))
+            transaction.set_rollback(True)
+        return measured
+
+    def test_query_budgets(self):
+        """Число запросов страниц не зависит от данных и в бюджете."""
+        small_scale, large_scale = self.scales
+        small = self.measure_routes(small_scale)
+        large = self.measure_routes(large_scale)
+        for name, (url, log) in large.items():
+            with self.subTest(route=name):
+                budget = self.query_budgets.get(
+                    name, self.default_query_budget
+                )
+                self.assertLessEqual(
+                    len(log), len(small[name][1]),
+                    f'{url}: запросов стало {len(log)} вместо '
+                    f'{len(small[name][1])} при росте данных '
+                    f'(N+1)\n{log.report()}'
+                )
+                self.assertLessEqual(
+                    len(log), budget,
+                    f'{url}: {len(log)} запросов при бюджете '
+                    f'{budget}\n{log.report()}'
+                )
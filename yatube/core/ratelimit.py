@@ -0,0 +1,114 @@
+"""Ограничение частоты запросов к изменяющим данные страницам.
+
+Лимит считается по скользящему окну отдельно для пользователя и для
+IP-адреса. Счётчики лежат в общем кэше, поэтому лимит действует
+на все воркеры. Отказ — дешёвый ответ 429 без шаблонов и запросов
+к базе.
+"""
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+RATE_UNITS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+REJECTED_KEY = 'ratelimit:rejected:{}'
+
+
+def parse_rate(rate):
+    """Разбирает лимит вида '10/m' в пару (число запросов, окно в секундах)."""
+    count, unit = rate.split('/')
+    return int(count), RATE_UNITS[unit]
+
+
+def _window_keys(key, window, now):
+    current = int(now // window)
+    return f'ratelimit:{key}:{current}', f'ratelimit:{key}:{current - 1}'
+
+
+def _incr(key, window):
+    cache.add(key, 0, window * 2)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Ключ истёк между add и incr.
+        cache.set(key, 1, window * 2)
+        return 1
+
+
+def hit(keys, limit, window):
+    """Учитывает запрос и возвращает False, если лимит уже исчерпан.
+
+    Сначала счётчик окна увеличивается, и решение принимается по
+    значению, которое вернул incr: параллельные запросы получают разные
+    значения и не проходят все разом. Отклонённый запрос снимает свои
+    увеличения и не расходует лимит.
+    """
+    now = time.time()
+    windows = [_window_keys(key, window, now) for key in keys]
+    previous_counts = cache.get_many(
+        [previous_key for _, previous_key in windows]
+    )
+    previous_weight = 1 - (now % window) / window
+    counted = []
+    allowed = True
+    for current_key, previous_key in windows:
+        count = _incr(current_key, window)
+        counted.append(current_key)
+        estimate = (
+            previous_counts.get(previous_key, 0) * previous_weight + count
+        )
+        if estimate > limit:
+            allowed = False
+            break
+    if not allowed:
+        for current_key in counted:
+            try:
+                cache.decr(current_key)
+            except ValueError:
+                pass
+    return allowed
+
+
+def record_rejection(name):
+    key = REJECTED_KEY.format(name)
+    cache.add(key, 0, None)
+    cache.incr(key)
+
+
+def rejection_stats():
+    """Число отклонённых запросов по каждому ограниченному адресу."""
+    keys = {name: REJECTED_KEY.format(name) for name in settings.RATELIMITS}
+    counts = cache.get_many(keys.values())
+    return {name: counts.get(key, 0) for name, key in keys.items()}
+
+
+def request_keys(request):
+    keys = [f'ip:{request.META.get("REMOTE_ADDR", "")}']
+    if request.user.is_authenticated:
+        keys.append(f'user:{request.user.pk}')
+    return keys
+
+
+def ratelimit(name, methods=('POST',)):
+    """Ограничивает запросы к представлению лимитом RATELIMITS[name]."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if settings.RATELIMIT_ENABLED and request.method in methods:
+                limit, window = parse_rate(settings.RATELIMITS[name])
+                keys = [f'{name}:{key}' for key in request_keys(request)]
+                if not hit(keys, limit, window):
+                    record_rejection(name)
+                    response = HttpResponse(
+                        'Слишком много запросов, попробуйте позже.',
+                        status=429,
+                        content_type='text/plain; charset=utf-8',
+                    )
+                    response['Retry-After'] = window
+                    return response
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
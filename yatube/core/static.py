@@ -0,0 +1,134 @@
+"""WSGI-раздача собранной статики в обход Django.
+
+Файлы из STATIC_ROOT индексируются один раз при старте. Файлы
+с хэшем в имени из манифеста отдаются с бессрочным кэшированием,
+остальные — с коротким. Если клиент принимает сжатие, отдаётся
+заранее сжатая версия файла.
+"""
+import json
+import mimetypes
+import os
+from wsgiref.headers import Headers
+
+from django.conf import settings
+
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=60'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+MANIFEST_NAME = 'staticfiles.json'
+
+
+class StaticFile:
+    def __init__(self, path, immutable):
+        self.path = path
+        stat = os.stat(path)
+        self.etag = f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+        self.content_type = (
+            mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        )
+        self.cache_control = (
+            IMMUTABLE_CACHE_CONTROL if immutable else DEFAULT_CACHE_CONTROL
+        )
+        self.variants = {
+            encoding: path + suffix
+            for encoding, suffix in ENCODINGS
+            if os.path.isfile(path + suffix)
+        }
+
+    def choose(self, accept_encoding):
+        """Возвращает кодировку, путь к файлу и его ETag.
+
+        У каждой кодировки свой ETag: тела разные, а ответ зависит
+        от Accept-Encoding.
+        """
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, variant in self.variants.items():
+            if encoding in accepted:
+                return encoding, variant, f'{self.etag[:-1]}-{encoding}"'
+        return None, self.path, self.etag
+
+
+def accepted_encodings(accept_encoding):
+    """Кодировки из Accept-Encoding, кроме запрещённых через q=0."""
+    accepted = set()
+    for part in accept_encoding.split(','):
+        encoding, *params = [item.strip() for item in part.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if encoding and quality > 0:
+            accepted.add(encoding.lower())
+    return accepted
+
+
+class StaticFilesApplication:
+    """Оборачивает WSGI-приложение и отдаёт статику до Django."""
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.root = root or settings.STATIC_ROOT
+        self.prefix = prefix or settings.STATIC_URL
+        self.files = self.scan()
+
+    def scan(self):
+        files = {}
+        if not self.root or not os.path.isdir(self.root):
+            return files
+        immutable = set()
+        manifest_path = os.path.join(self.root, MANIFEST_NAME)
+        if os.path.isfile(manifest_path):
+            with open(manifest_path) as manifest:
+                immutable = set(json.load(manifest).get('paths', {}).values())
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(('.br', '.gz')):
+                    continue
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, '/')
+                files[self.prefix + name] = StaticFile(
+                    path, name in immutable
+                )
+        return files
+
+    def __call__(self, environ, start_response):
+        static_file = self.files.get(environ.get('PATH_INFO', ''))
+        if static_file is None or environ['REQUEST_METHOD'] not in (
+            'GET', 'HEAD'
+        ):
+            return self.application(environ, start_response)
+        return self.serve(static_file, environ, start_response)
+
+    def serve(self, static_file, environ, start_response):
+        encoding, path, etag = static_file.choose(
+            environ.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        headers = Headers([
+            ('Cache-Control', static_file.cache_control),
+            ('ETag', etag),
+            ('Vary', 'Accept-Encoding'),
+        ])
+        if environ.get('HTTP_IF_NONE_MATCH') == etag:
+            start_response('304 Not Modified', headers.items())
+            return []
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        headers['Content-Type'] = static_file.content_type
+        headers['Content-Length'] = str(os.path.getsize(path))
+        start_response('200 OK', headers.items())
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if file_wrapper:
+            return file_wrapper(open(path, 'rb'))
+        return read_chunks(path)
+
+
+def read_chunks(path, chunk_size=8192):
+    with open(path, 'rb') as body:
+        yield from iter(lambda: body.read(chunk_size), b'')
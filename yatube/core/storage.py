@@ -0,0 +1,124 @@
+import gzip
+import threading
+from urllib.parse import urljoin
+
+import brotli
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.utils import timezone
+from django.utils.encoding import filepath_to_uri
+
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.html', '.txt', '.json', '.xml', '.map', '.ico',
+)
+MIN_COMPRESS_SIZE = 256
+
+
+def compress_file(path):
+    """Кладёт рядом с файлом сжатые gzip и brotli версии, если они меньше."""
+    if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+        return []
+    with open(path, 'rb') as source:
+        content = source.read()
+    if len(content) < MIN_COMPRESS_SIZE:
+        return []
+    variants = {
+        '.gz': gzip.compress(content, compresslevel=9, mtime=0),
+        '.br': brotli.compress(content),
+    }
+    written = []
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(content):
+            with open(path + suffix, 'wb') as target:
+                target.write(compressed)
+            written.append(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэширует имена статики и заранее сжимает файлы при collectstatic."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name in names:
+            compress_file(self.path(name))
+
+
+class InMemoryStorage(Storage):
+    """Хранилище файлов в памяти процесса для тестов.
+
+    Содержимое общее для всех экземпляров, поэтому файл, сохранённый
+    через поле модели, видят и sorl-thumbnail, и сборка версий картинок.
+    Тесты не пишут на диск и не мешают друг другу при параллельном
+    запуске в разных процессах.
+    """
+    _files = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._files.clear()
+
+    def _open(self, name, mode='rb'):
+        with self._lock:
+            if name not in self._files:
+                raise FileNotFoundError(name)
+            content, _ = self._files[name]
+        return ContentFile(content, name=name)
+
+    def _save(self, name, content):
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        data = b''.join(
+            chunk.encode() if isinstance(chunk, str) else chunk
+            for chunk in content.chunks()
+        )
+        with self._lock:
+            self._files[name] = (data, timezone.now())
+        return name
+
+    def delete(self, name):
+        with self._lock:
+            self._files.pop(name, None)
+
+    def exists(self, name):
+        return name in self._files
+
+    def size(self, name):
+        return len(self._open(name).read())
+
+    def url(self, name):
+        return urljoin(settings.MEDIA_URL, filepath_to_uri(name))
+
+    def listdir(self, path):
+        prefix = path.rstrip('/') + '/' if path else ''
+        directories, files = set(), set()
+        for name in list(self._files):
+            if not name.startswith(prefix):
+                continue
+            head, _, tail = name[len(prefix):].partition('/')
+            if tail:
+                directories.add(head)
+            else:
+                files.add(head)
+        return sorted(directories), sorted(files)
+
+    def get_modified_time(self, name):
+        with self._lock:
+            if name not in self._files:
+                raise FileNotFoundError(name)
+            return self._files[name][1]
+
+    get_created_time = get_accessed_time = get_modified_time
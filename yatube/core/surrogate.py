@@ -0,0 +1,177 @@
+"""Кэширование страниц на CDN и их сброс по ключам.
+
+Ответы анонимным пользователям помечаются Surrogate-Control и
+списком ключей (post-1 author-5 group-2), а страницы пользователей —
+Cache-Control: private, чтобы CDN их не сохранял. Исключение —
+страницы-оболочки в режимах FRAGMENTS_MODE 'esi' и 'js': блоки
+пользователя в них вынесены в {% fragment %}, и одна копия годится
+всем. Браузеру срок
+хранения не даётся: после входа он не должен показывать сохранённую
+анонимную страницу. При изменении данных
+ключи копятся в буфере и уходят на SURROGATE_PURGE_URL пачками: частые
+правки одного поста дают один запрос на сброс.
+"""
+import threading
+import time
+from functools import partial, wraps
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.cache import cc_delim_re, patch_cache_control
+
+from .buffers import WriteBehindBuffer
+
+
+def set_surrogate_keys(response, keys):
+    response[settings.SURROGATE_KEY_HEADER] = ' '.join(sorted(set(keys)))
+    return response
+
+
+def edge_cache(view_func=None, *, shell=False):
+    """Разрешает CDN хранить ответы представления анонимам.
+
+    CDN хранит ответ EDGE_CACHE_TIMEOUT секунд по Surrogate-Control,
+    а браузер перепроверяет его каждый раз: max-age=0 и Vary: Cookie.
+    Ответ вошедшему пользователю помечается private. С shell=True
+    страница не зависит от пользователя вне режима 'inline', и её
+    копия общая для всех: без private и без Vary: Cookie. Окончательно
+    заголовки выставляет SurrogateMiddleware.
+    """
+    if view_func is None:
+        return partial(edge_cache, shell=shell)
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        shared = shell and settings.FRAGMENTS_MODE != 'inline'
+        if request.user.is_authenticated and not shared:
+            patch_cache_control(response, private=True)
+            return response
+        if request.method not in ('GET', 'HEAD') or (
+            response.status_code != 200
+        ):
+            return response
+        patch_cache_control(response, public=True, max_age=0)
+        surrogate_control = f'max-age={settings.EDGE_CACHE_TIMEOUT}'
+        if settings.FRAGMENTS_MODE == 'esi':
+            surrogate_control += ', content="ESI/1.0"'
+        response['Surrogate-Control'] = surrogate_control
+        response.shared_shell = shared
+        return response
+    return wrapper
+
+
+def _drop_cookie_vary(response):
+    vary = [
+        header for header in cc_delim_re.split(response.get('Vary', ''))
+        if header and header.lower() != 'cookie'
+    ]
+    if vary:
+        response['Vary'] = ', '.join(vary)
+    elif response.has_header('Vary'):
+        del response['Vary']
+
+
+class SurrogateMiddleware:
+    """Доводит заголовки CDN после остальных middleware.
+
+    Стоит первым в MIDDLEWARE, чтобы видеть cookie сессии и CSRF,
+    выставленные позже представления. Ответ с cookie CDN не хранит.
+    Vary: Cookie остаётся для браузеров; чтобы анонимы с посторонними
+    cookie делили одну копию, CDN может отбрасывать его сам для
+    запросов без cookie сессии.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not response.has_header('Surrogate-Control'):
+            return response
+        if response.cookies:
+            del response['Surrogate-Control']
+            patch_cache_control(response, private=True)
+        elif getattr(response, 'shared_shell', False):
+            # Vary: Cookie от сессии разбил бы общую копию по посетителям.
+            _drop_cookie_vary(response)
+        return response
+
+
+def send_purge(key_sets):
+    """Отправляет CDN запросы на сброс ключей, не больше пачки за раз."""
+    keys = sorted(set().union(*key_sets))
+    batch_size = settings.SURROGATE_PURGE_BATCH
+    for start in range(0, len(keys), batch_size):
+        request = Request(
+            settings.SURROGATE_PURGE_URL,
+            method='POST',
+            headers={
+                settings.SURROGATE_KEY_HEADER: ' '.join(
+                    keys[start:start + batch_size]
+                ),
+            },
+        )
+        with urlopen(request, timeout=settings.SURROGATE_PURGE_TIMEOUT):
+            pass
+
+
+class PurgeDispatcher(WriteBehindBuffer):
+    """Буфер сброса с задержкой до паузы в изменениях.
+
+    В фоновом режиме запрос уходит через `interval` секунд после
+    последнего изменения, но не позже `max_delay` после первого.
+    """
+
+    def __init__(self, flush_func, max_delay, **kwargs):
+        super().__init__(flush_func, **kwargs)
+        self.max_delay = max_delay
+        self._first_added_at = None
+
+    def add(self, item):
+        if not self.background:
+            super().add(item)
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._items.append(item)
+            if self._first_added_at is None:
+                self._first_added_at = now
+            due = (
+                len(self._items) >= self.threshold
+                or now - self._first_added_at >= self.max_delay
+            )
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not due:
+                self._timer = threading.Timer(
+                    self.interval, self._flush_in_background
+                )
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self._flush_quietly()
+
+    def flush(self):
+        with self._lock:
+            self._first_added_at = None
+        super().flush()
+
+
+purge_buffer = PurgeDispatcher(
+    send_purge,
+    max_delay=settings.SURROGATE_PURGE_MAX_DELAY,
+    threshold=settings.SURROGATE_PURGE_BATCH,
+    interval=settings.SURROGATE_PURGE_DELAY,
+    background=settings.SURROGATE_PURGE_BACKGROUND,
+)
+
+
+def purge(*keys):
+    """Ставит ключи в очередь на сброс после фиксации транзакции."""
+    if not settings.SURROGATE_PURGE_URL or not keys:
+        return
+    keys = frozenset(keys)
+    transaction.on_commit(lambda: purge_buffer.add(keys))
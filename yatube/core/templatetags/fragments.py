@@ -0,0 +1,58 @@
+"""Дырки в общих страницах под блоки, зависящие от пользователя.
+
+{% fragment 'header' %} в режиме FRAGMENTS_MODE = 'inline' просто
+подключает шаблон. В режиме 'esi' вместо него выводится <esi:include>,
+который заполнит Varnish или CDN, а в режиме 'js' — пустой блок,
+который загрузит скрипт из {% fragment_loader %}.
+Так тело страницы не зависит от пользователя и кэшируется для всех.
+
+Блоку можно передать параметры: {% fragment 'post_controls'
+post_id=post.pk %}. Шаблон блока видит их в `params`; через адрес
+они приходят строками, а пустые значения не передаются.
+"""
+from urllib.parse import urlencode
+
+from django import template
+from django.conf import settings
+from django.urls import reverse
+from django.utils.html import format_html
+
+register = template.Library()
+
+
+def fragment_url(name, view_name, params=None):
+    url = reverse('fragment', kwargs={'name': name})
+    query = {'view': view_name} if view_name else {}
+    query.update(params or {})
+    if query:
+        url += '?' + urlencode(query)
+    return url
+
+
+@register.simple_tag(takes_context=True)
+def fragment(context, name, **params):
+    mode = settings.FRAGMENTS_MODE
+    params = {
+        key: value for key, value in params.items()
+        if value is not None and value != ''
+    }
+    if mode == 'inline':
+        template = context.template.engine.get_template(
+            settings.FRAGMENTS[name]
+        )
+        with context.push(params=params):
+            return template.render(context)
+    # На страницах ошибок адрес не разрешён, а у заранее отрендеренных
+    # страниц ошибок может не быть и самого запроса.
+    request = context.get('request')
+    url = fragment_url(name, getattr(
+        getattr(request, 'resolver_match', None), 'view_name', ''
+    ), params)
+    if mode == 'esi':
+        return format_html('<esi:include src="{}"/>', url)
+    return format_html('<div data-fragment="{}"></div>', url)
+
+
+@register.inclusion_tag('includes/fragments.html')
+def fragment_loader():
+    return {'enabled': settings.FRAGMENTS_MODE == 'js'}
@@ -0,0 +1,44 @@
+from django import template
+
+register = template.Library()
+
+
+@register.filter
+def editable_by(post, viewer):
+    return viewer.can_edit(post)
+
+
+@register.filter
+def followed_by(author, viewer):
+    return viewer.follows(author)
+
+
+@register.filter
+def followable_by(author, viewer):
+    return viewer.can_follow(author)
+
+
+def _author_id(value):
+    # В блоки-фрагменты id приходит строкой из адреса.
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@register.filter
+def written_by(author_id, viewer):
+    """editable_by по id автора, для блоков без объекта поста."""
+    author_id = _author_id(author_id)
+    return author_id is not None and author_id == viewer.user_id
+
+
+@register.filter
+def author_followed_by(author_id, viewer):
+    return _author_id(author_id) in viewer.followed_ids
+
+
+@register.filter
+def author_followable_by(author_id, viewer):
+    author_id = _author_id(author_id)
+    return author_id is not None and author_id != viewer.user_id
@@ -0,0 +1,78 @@
+"""Общая инфраструктура тестов.
+
+Snapshot собирает объекты один раз за процесс, а каждый тестовый
+класс вставляет их через bulk_create — по запросу на модель вместо
+create() и сигналов на каждый объект. SnapshotTestCase делает это
+в setUpTestData, то есть один раз на класс, и очищает хранилище
+медиа в памяти после класса.
+"""
+from django.core.cache import cache
+from django.core.management.color import no_style
+from django.db import connection
+from django.test import TestCase
+
+from .storage import InMemoryStorage
+
+
+class Snapshot:
+    """Набор объектов, собранный функцией build один раз за сессию.
+
+    build возвращает словарь {имя: объект или список объектов}. У всех
+    объектов должны быть заданы id, чтобы связи между ними сохранились.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self._rows = None
+
+    def _collect(self):
+        rows = {}
+        for name, objects in self.build().items():
+            many = isinstance(objects, (list, tuple))
+            rows[name] = (many, [
+                (type(obj), {
+                    field.attname: getattr(obj, field.attname)
+                    for field in obj._meta.concrete_fields
+                })
+                for obj in (objects if many else [objects])
+            ])
+        return rows
+
+    def load(self):
+        """Вставляет снимок в базу и возвращает свежие объекты."""
+        if self._rows is None:
+            self._rows = self._collect()
+        by_model = {}
+        loaded = {}
+        for name, (many, rows) in self._rows.items():
+            objects = [model(**values) for model, values in rows]
+            for obj in objects:
+                by_model.setdefault(type(obj), []).append(obj)
+            loaded[name] = objects if many else objects[0]
+        for model, objects in by_model.items():
+            model._default_manager.bulk_create(objects)
+        statements = connection.ops.sequence_reset_sql(no_style(), by_model)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+        return loaded
+
+
+class SnapshotTestCase(TestCase):
+    """TestCase, данные которого загружаются из снимка."""
+    snapshot = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        if cls.snapshot is not None:
+            for name, value in cls.snapshot.load().items():
+                setattr(cls, name, value)
+            # bulk_create не шлёт сигналы, сбрасывающие кэши по данным,
+            # поэтому в кэше могли остаться объекты других классов.
+            cache.clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        InMemoryStorage.clear()
@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import SimpleTestCase
+
+from ..buffers import WriteBehindBuffer
+
+
+class WriteBehindBufferTests(SimpleTestCase):
+    def setUp(self):
+        self.flush_func = mock.Mock(
+            side_effect=OperationalError('database is locked')
+        )
+        self.flush_func.__name__ = 'flush_views'
+        self.buffer = WriteBehindBuffer(self.flush_func, threshold=2)
+
+    def test_add_survives_flush_error(self):
+        """Ошибка сброса из add() пишется в лог, записи не теряются."""
+        self.buffer.add(1)
+        with self.assertLogs('core.buffers', 'ERROR'):
+            self.buffer.add(2)
+        self.assertEqual(self.buffer.pending(), [1, 2])
+        self.flush_func.side_effect = None
+        self.buffer.add(3)
+        self.flush_func.assert_called_with([1, 2, 3])
+        self.assertEqual(self.buffer.pending(), [])
+
+    def test_explicit_flush_raises(self):
+        """Явный flush() пробрасывает ошибку вызывающему."""
+        self.buffer.add(1)
+        with self.assertRaises(OperationalError):
+            self.buffer.flush()
+        self.assertEqual(self.buffer.pending(), [1])
+
+    def test_clear_drops_pending(self):
+        """clear() отбрасывает записи без сброса."""
+        self.buffer.add(1)
+        self.buffer.clear()
+        self.assertEqual(self.buffer.pending(), [])
+        self.flush_func.assert_not_called()
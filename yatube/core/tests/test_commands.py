@@ -0,0 +1,30 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class BenchmarkViewsTests(TestCase):
+    def test_benchmark_reports_throughput(self):
+        """Команда печатает пропускную способность и число запросов."""
+        out = StringIO()
+        call_command(
+            'benchmark_views', '/about/author/',
+            requests=4, concurrency=2, stdout=out
+        )
+        report = out.getvalue()
+        self.assertIn('/about/author/', report)
+        self.assertIn('SQL-запросов 0', report)
+        self.assertIn('ошибок 0', report)
+
+
+class BenchmarkContextTests(TestCase):
+    def test_benchmark_reports_before_and_after(self):
+        """Команда печатает время процессоров до и после по сценариям."""
+        out = StringIO()
+        call_command('benchmark_context', renders=10, repeat=1, stdout=out)
+        report = out.getvalue()
+        for scenario in ('Фрагмент', 'Подвал', 'Лента'):
+            self.assertIn(scenario, report)
+        self.assertIn('было', report)
+        self.assertIn('стало', report)
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from ..context_processors.lazy import lazy_processor, process_cached
+from ..context_processors.year import current_year, year
+
+
+class LazyProcessorTests(TestCase):
+    def test_value_computed_only_when_read(self):
+        """Значение считается, только если шаблон его прочитал."""
+        factory = mock.Mock(return_value='значение')
+        processor = lazy_processor(value=factory)
+        context = Context(processor(RequestFactory().get('/')))
+        Template('без переменных').render(context)
+        factory.assert_not_called()
+        self.assertEqual(Template('{{ value }}').render(context), 'значение')
+        factory.assert_called_once()
+
+    def test_process_cached_until_expiry(self):
+        """process_cached пересчитывает значение после срока."""
+        counter = mock.Mock(side_effect=[1, 2])
+        cached = process_cached(expires_at=lambda value: 100.0)(counter)
+        with mock.patch('time.time', return_value=50.0):
+            self.assertEqual(cached(), 1)
+            self.assertEqual(cached(), 1)
+        with mock.patch('time.time', return_value=150.0):
+            self.assertEqual(cached(), 2)
+        self.assertEqual(counter.call_count, 2)
+
+
+class YearProcessorTests(TestCase):
+    def setUp(self):
+        current_year.cache_clear()
+
+    def test_year_is_not_computed_per_render(self):
+        """Год считается один раз на процесс, а не на каждый рендер."""
+        context = year(RequestFactory().get('/'))
+        template = Template('{{ year }}')
+        with mock.patch(
+            'core.context_processors.year.timezone.now',
+            wraps=timezone.now,
+        ) as now:
+            first = template.render(Context(context))
+            second = template.render(Context(year(None)))
+        self.assertEqual(first, second)
+        self.assertEqual(now.call_count, 1)
+
+    def test_footer_shows_year(self):
+        """Подвал страницы показывает текущий год."""
+        response = self.client.get('/about/author/')
+        self.assertContains(response, f'© {current_year()}')
@@ -0,0 +1,94 @@
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+
+from posts.models import User
+
+from ..errors import (
+    _prerendered, flush_missing_paths, missing_paths_buffer,
+    top_missing_paths,
+)
+
+
+@override_settings(ERROR_PAGES_PRERENDERED=True)
+class ErrorPagesTests(TestCase):
+    def setUp(self):
+        missing_paths_buffer.flush()
+        cache.clear()
+        _prerendered.clear()
+
+    def test_anonymous_404_prerendered_without_queries(self):
+        """Аноним без сессии получает готовую 404 без запросов к базе."""
+        self.client.get('/missing/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/other/missing/')
+        self.assertEqual(response.status_code, 404)
+        self.assertTemplateNotUsed(response, 'core/404.html')
+        self.assertContains(
+            response, 'Такой страницы не существует', status_code=404
+        )
+
+    def test_prerendered_once_per_process(self):
+        """Страница рендерится один раз на процесс."""
+        with mock.patch(
+            'core.errors.render_to_string', return_value='404'
+        ) as render_to_string:
+            for _ in range(3):
+                self.client.get('/missing/')
+        render_to_string.assert_called_once()
+
+    def test_logged_in_user_gets_full_page(self):
+        """Пользователь с сессией видит полную страницу со своей шапкой."""
+        client = Client()
+        client.force_login(User.objects.create_user(username='reader'))
+        response = client.get('/missing/')
+        self.assertTemplateUsed(response, 'core/404.html')
+        self.assertContains(response, '/missing/', status_code=404)
+
+    def test_csrf_failure_returns_403(self):
+        """Отказ проверки CSRF отвечает кодом 403."""
+        client = Client(enforce_csrf_checks=True)
+        response = client.post('/auth/login/', {'username': 'bot'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_missing_paths_counted(self):
+        """Частые адреса 404 попадают в статистику."""
+        for _ in range(3):
+            self.client.get('/wp-login.php')
+        self.client.get('/missing/')
+        missing_paths_buffer.flush()
+        self.assertEqual(
+            top_missing_paths(1), [('/wp-login.php', 3)]
+        )
+        out = StringIO()
+        call_command('not_found_stats', stdout=out)
+        self.assertIn('3\t/wp-login.php', out.getvalue())
+
+    def test_concurrent_flushes_keep_counts(self):
+        """Параллельные сбросы воркеров не теряют счётчики друг друга."""
+        cache_get = LocMemCache.get
+
+        def slow_get(self, *args, **kwargs):
+            # Между чтением и записью статистики успевают другие потоки.
+            value = cache_get(self, *args, **kwargs)
+            time.sleep(0.001)
+            return value
+
+        threads = [
+            threading.Thread(
+                target=flush_missing_paths, args=(['/wp-login.php'] * 2,)
+            )
+            for _ in range(5)
+        ]
+        with mock.patch.object(LocMemCache, 'get', slow_get):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(top_missing_paths(), [('/wp-login.php', 10)])
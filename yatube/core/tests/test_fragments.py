@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Follow, Group, Post
+
+from ..errors import _prerendered
+
+User = get_user_model()
+
+
+class FragmentTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            text='Пост', author=cls.author, group=cls.group
+        )
+        Follow.objects.create(user=cls.user, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_fragment_endpoint(self):
+        """Блок шапки рендерится для пользователя и не кэшируется CDN."""
+        response = self.authorized_client.get(
+            reverse('fragment', kwargs={'name': 'header'}),
+            {'view': 'posts:trending'}
+        )
+        self.assertContains(response, 'Пользователь: reader')
+        self.assertContains(response, 'active" href="/trending/"')
+        self.assertIn('private', response['Cache-Control'])
+        response = self.guest_client.get(
+            reverse('fragment', kwargs={'name': 'unknown'})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(FRAGMENTS_MODE='esi')
+    def test_esi_shell_shared_by_users(self):
+        """В режиме ESI главная одна для всех пользователей."""
+        shell = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(
+            shell, '<esi:include src="/fragments/header/?view=posts%3Aindex"/>'
+        )
+        self.assertNotContains(shell, 'reader')
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertEqual(response.content, shell.content)
+
+    @override_settings(FRAGMENTS_MODE='esi')
+    def test_esi_feeds_and_profile_shared(self):
+        """Ленты и профиль в режиме ESI — общая копия и для вошедших."""
+        urls = (
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'author'}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                shell = self.authorized_client.get(url)
+                self.assertNotIn('private', shell['Cache-Control'])
+                self.assertIn('ESI/1.0', shell['Surrogate-Control'])
+                self.assertNotIn('Cookie', shell.get('Vary', ''))
+                self.assertContains(
+                    shell, '/fragments/post_controls/?view='
+                )
+                self.assertNotContains(shell, 'Вы подписаны на автора')
+                response = self.guest_client.get(url)
+                self.assertEqual(response.content, shell.content)
+
+    def test_fragments_with_params(self):
+        """Блоки поста и подписки рендерятся по параметрам из адреса."""
+        response = self.authorized_client.get(
+            reverse('fragment', kwargs={'name': 'post_controls'}),
+            {'post_id': self.post.id, 'author_id': self.author.id}
+        )
+        self.assertContains(response, 'Вы подписаны на автора')
+        author_client = Client()
+        author_client.force_login(self.author)
+        response = author_client.get(
+            reverse('fragment', kwargs={'name': 'post_controls'}),
+            {'post_id': self.post.id, 'author_id': self.author.id}
+        )
+        self.assertContains(response, 'редактировать запись')
+        response = self.authorized_client.get(
+            reverse('fragment', kwargs={'name': 'follow_button'}),
+            {'author_id': self.author.id, 'username': 'author'}
+        )
+        self.assertContains(response, 'Отписаться')
+        response = self.authorized_client.get(
+            reverse('fragment', kwargs={'name': 'follow_button'}),
+            {'author_id': 'x', 'username': 'author'}
+        )
+        self.assertNotContains(response, 'Подписаться')
+
+    @override_settings(FRAGMENTS_MODE='js')
+    def test_js_placeholders(self):
+        """В режиме js страница подгружает блоки скриптом."""
+        response = self.guest_client.get(reverse('posts:trending'))
+        self.assertContains(
+            response,
+            '<div data-fragment="/fragments/switcher/?view=posts%3Atrending">'
+        )
+        self.assertContains(response, '<script>')
+
+    @override_settings(FRAGMENTS_MODE='esi')
+    def test_esi_404_page(self):
+        """Страница 404 в режиме ESI рендерится с дыркой под шапку."""
+        _prerendered.clear()
+        for prerendered in (False, True):
+            with self.subTest(prerendered=prerendered):
+                with override_settings(ERROR_PAGES_PRERENDERED=prerendered):
+                    response = self.guest_client.get('/missing/')
+                self.assertContains(
+                    response,
+                    '<esi:include src="/fragments/header/"/>',
+                    status_code=404
+                )
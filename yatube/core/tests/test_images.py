@@ -0,0 +1,62 @@
+import shutil
+import tempfile
+import time
+from threading import Thread
+
+from django.test import SimpleTestCase
+
+from ..images import DiskCache, Resizer, image_url, verify
+
+
+class ImageUrlTests(SimpleTestCase):
+    def test_signature_covers_geometry_and_format(self):
+        """Подпись адреса проверяет имя, размер и формат."""
+        url = image_url('posts/a.jpg', 480, 170)
+        signature = url.split('/')[2]
+        self.assertEqual(url, f'/img/{signature}/480x170/jpeg/posts/a.jpg')
+        self.assertTrue(verify(signature, 'posts/a.jpg', 480, 170, 'jpeg'))
+        self.assertFalse(verify(signature, 'posts/a.jpg', 480, 171, 'jpeg'))
+        self.assertFalse(verify(signature, 'posts/b.jpg', 480, 170, 'jpeg'))
+        self.assertFalse(verify(signature, 'posts/a.jpg', 480, 170, 'gif'))
+
+
+class DiskCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+
+    def test_least_recently_used_evicted(self):
+        """При переполнении удаляются давно не читанные копии."""
+        disk_cache = DiskCache(self.root, max_size=25)
+        for key in ('aa-1', 'bb-2', 'cc-3'):
+            disk_cache.set(key, b'x' * 10)
+            time.sleep(0.01)
+        self.assertIsNone(disk_cache.get('aa-1'))
+        self.assertIsNotNone(disk_cache.get('bb-2'))
+        self.assertIsNotNone(disk_cache.get('cc-3'))
+
+
+class ResizerTests(SimpleTestCase):
+    def test_same_key_built_once(self):
+        """Одновременные запросы одной копии строят её один раз."""
+        calls = []
+
+        def build(key):
+            calls.append(key)
+            time.sleep(0.05)
+            return key
+
+        resizer = Resizer(workers=2, max_pending=4)
+        results = []
+        threads = [
+            Thread(target=lambda: results.append(
+                resizer.build('k', build, 'k')
+            ))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['k', 'k', 'k'])
+        self.assertEqual(calls, ['k'])
@@ -0,0 +1,128 @@
+import socket
+import socketserver
+import threading
+from datetime import timedelta
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..mail import QueuedEmailBackend, RETRY_DELAY, deliver_batch
+from ..models import OutgoingEmail
+
+SMTP_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Минимальный SMTP-сервер: принимает письма и запоминает их."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost')
+        for raw_line in self.rfile:
+            command = raw_line.decode().strip().upper()
+            if command == 'DATA':
+                self.reply('354 end with .')
+                lines = []
+                for data_line in self.rfile:
+                    if data_line == b'.\r\n':
+                        break
+                    lines.append(data_line)
+                self.server.messages.append(b''.join(lines))
+                self.reply('250 queued')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.connections = 0
+        self.messages = []
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class QueuedEmailTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = SMTPServer()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.connections = 0
+        self.server.messages = []
+
+    def enqueue(self, count):
+        messages = [
+            mail.EmailMessage(
+                f'Письмо {i}', 'Текст', 'from@yatube.ru', ['to@yatube.ru']
+            )
+            for i in range(count)
+        ]
+        QueuedEmailBackend().send_messages(messages)
+
+    def test_backend_only_enqueues(self):
+        """Бэкенд сохраняет письма в очередь, не отправляя их."""
+        self.enqueue(2)
+        self.assertEqual(
+            OutgoingEmail.objects.filter(
+                status=OutgoingEmail.PENDING
+            ).count(),
+            2
+        )
+        self.assertEqual(self.server.messages, [])
+
+    def test_batch_delivered_over_one_connection(self):
+        """Пачка писем уходит через одно SMTP-соединение."""
+        self.enqueue(3)
+        with override_settings(
+            EMAIL_DELIVERY_BACKEND=SMTP_BACKEND,
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=self.server.server_address[1],
+        ):
+            self.assertEqual(deliver_batch(), 3)
+        self.assertEqual(len(self.server.messages), 3)
+        self.assertEqual(self.server.connections, 1)
+        self.assertFalse(OutgoingEmail.objects.exclude(
+            status=OutgoingEmail.SENT
+        ).exists())
+
+    def test_failed_delivery_retried_with_backoff(self):
+        """Недоставленное письмо откладывается на потом."""
+        self.enqueue(1)
+        started = timezone.now()
+        with override_settings(
+            EMAIL_DELIVERY_BACKEND=SMTP_BACKEND,
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=free_port(),
+        ):
+            deliver_batch()
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, OutgoingEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreaterEqual(email.next_attempt_at, started + RETRY_DELAY)
+        self.assertLess(
+            email.next_attempt_at, started + RETRY_DELAY + timedelta(minutes=1)
+        )
+        self.assertEqual(deliver_batch(), 0)
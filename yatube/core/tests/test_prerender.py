@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+
+from ..prerender import (
+    MANIFEST_NAME, PrerenderedPagesApplication, static_paths,
+)
+
+
+class PrerenderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.mkdtemp()
+        call_command('prerender_pages', root=cls.root, stdout=StringIO())
+        with open(os.path.join(cls.root, MANIFEST_NAME)) as manifest:
+            cls.manifest = json.load(manifest)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.root, ignore_errors=True)
+
+    def setUp(self):
+        self.application = PrerenderedPagesApplication(
+            self.django_application, root=self.root
+        )
+
+    def django_application(self, environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/html')])
+        return [b'django']
+
+    def request(self, path, **environ):
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, **environ}
+        response = {}
+
+        def start_response(status, headers):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        response['body'] = b''.join(self.application(environ, start_response))
+        return response
+
+    def test_about_pages_marked_static(self):
+        """Страницы about помечены для пререндера."""
+        self.assertEqual(
+            set(static_paths()), {'/about/author/', '/about/tech/'}
+        )
+
+    def test_prerendered_page_matches_dynamic(self):
+        """Готовая страница совпадает с рендером для анонима."""
+        response = self.request('/about/author/')
+        self.assertEqual(response['status'], '200 OK')
+        self.assertEqual(
+            response['body'], Client().get('/about/author/').content
+        )
+        self.assertEqual(
+            response['headers']['ETag'],
+            self.manifest['/about/author/']['etag']
+        )
+
+    def test_etag_revalidation(self):
+        """Совпавший ETag даёт ответ 304 без тела."""
+        etag = self.manifest['/about/tech/']['etag']
+        response = self.request('/about/tech/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response['status'], '304 Not Modified')
+        self.assertEqual(response['body'], b'')
+
+    def test_logged_in_user_reaches_django(self):
+        """Запрос с cookie сессии рендерится Django со своей шапкой."""
+        response = self.request('/about/author/', HTTP_COOKIE='sessionid=1')
+        self.assertEqual(response['body'], b'django')
+
+    def test_other_requests_reach_django(self):
+        """Другие адреса, методы и запросы с параметрами идут в Django."""
+        for path, environ in (
+            ('/', {}),
+            ('/about/author/', {'REQUEST_METHOD': 'POST'}),
+            ('/about/author/', {'QUERY_STRING': 'utm=1'}),
+        ):
+            with self.subTest(path=path, environ=environ):
+                self.assertEqual(
+                    self.request(path, **environ)['body'], b'django'
+                )
@@ -0,0 +1,32 @@
+from django.test import TestCase
+
+from ..querybudget import QueryBudgetMixin, QueryLog, iter_routes, measure
+
+
+class QueryBudgetToolsTests(TestCase):
+    def test_routes_with_parameters(self):
+        """Маршруты URLconf перечисляются с именами параметров."""
+        routes = dict(iter_routes('posts.urls'))
+        self.assertEqual(routes['posts:index'], [])
+        self.assertEqual(routes['posts:post_edit'], ['post_id'])
+        self.assertEqual(routes['posts:profile_follow'], ['username'])
+
+    def test_log_reports_sql_with_origin(self):
+        """Журнал показывает SQL и место его вызова в коде проекта."""
+        log = measure(self.client, '/about/author/')
+        self.assertEqual(len(log), 0)
+        log = QueryLog()
+        log.queries.append(('SELECT 1', ['posts/views.py:1 in index']))
+        self.assertEqual(
+            log.report(), '1. SELECT 1\n     posts/views.py:1 in index'
+        )
+
+    def test_missing_load_data_fails_with_message(self):
+        """Без load_data проверка бюджета падает с понятным сообщением."""
+        class WithoutData(QueryBudgetMixin, TestCase):
+            pass
+
+        with self.assertRaisesMessage(
+            AssertionError, 'WithoutData должен определить load_data'
+        ):
+            WithoutData('load_data').load_data(1)
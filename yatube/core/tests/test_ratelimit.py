@@ -0,0 +1,87 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+from ..ratelimit import hit, rejection_stats
+
+RATELIMITS = {
+    'posts:post_create': '10/m',
+    'posts:add_comment': '2/m',
+    'posts:profile_follow': '30/m',
+    'users:signup': '1/h',
+}
+
+
+@override_settings(RATELIMITS=RATELIMITS)
+class RateLimitTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.post = Post.objects.create(text='Тестовый текст', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_comments_over_limit_rejected(self):
+        """Комментарии сверх лимита отклоняются кодом 429."""
+        url = reverse('posts:add_comment', kwargs={'post_id': self.post.id})
+        for _ in range(2):
+            response = self.authorized_client.post(url, {'text': 'Текст'})
+            self.assertEqual(response.status_code, 302)
+        # Только чтение сессии и пользователя для login_required.
+        with self.assertNumQueries(2):
+            response = self.authorized_client.post(url, {'text': 'Текст'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+        self.assertEqual(self.post.comments.count(), 2)
+        self.assertEqual(rejection_stats()['posts:add_comment'], 1)
+
+    def test_limit_is_per_ip_for_guests(self):
+        """Гостей ограничивает лимит по IP-адресу."""
+        url = reverse('users:signup')
+        self.client.post(url, {}, REMOTE_ADDR='10.0.0.1')
+        response = self.client.post(url, {}, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 429)
+        response = self.client.post(url, {}, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_requests_not_limited(self):
+        """Открытие формы не расходует лимит."""
+        url = reverse('users:signup')
+        for _ in range(3):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_concurrent_hits_do_not_exceed_limit(self):
+        """Параллельные запросы не проходят сверх лимита."""
+        cache_get = LocMemCache.get
+        results = []
+
+        def slow_get(self, *args, **kwargs):
+            # Все потоки успевают прочитать счётчики до чужих incr.
+            value = cache_get(self, *args, **kwargs)
+            time.sleep(0.01)
+            return value
+
+        def request():
+            results.append(hit(['ip:10.0.0.1'], 3, 60))
+
+        threads = [threading.Thread(target=request) for _ in range(10)]
+        with mock.patch.object(LocMemCache, 'get', slow_get):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results.count(True), 3)
+        self.assertFalse(hit(['ip:10.0.0.1'], 3, 60))
+        self.assertTrue(hit(['ip:10.0.0.1'], 4, 60))
@@ -0,0 +1,123 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+import brotli
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from ..static import IMMUTABLE_CACHE_CONTROL, StaticFilesApplication
+
+CSS = 'body { color: red; }\n' * 50
+
+
+class StaticPipelineTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.source = tempfile.mkdtemp()
+        cls.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(cls.source, 'css'))
+        with open(os.path.join(cls.source, 'css', 'site.css'), 'w') as css:
+            css.write(CSS)
+        with override_settings(
+            STATICFILES_DIRS=[cls.source],
+            STATIC_ROOT=cls.root,
+            STATICFILES_FINDERS=[
+                'django.contrib.staticfiles.finders.FileSystemFinder'
+            ],
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'
+            ),
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0)
+        with open(os.path.join(cls.root, 'staticfiles.json')) as manifest:
+            cls.hashed_name = json.load(manifest)['paths']['css/site.css']
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.source, ignore_errors=True)
+        shutil.rmtree(cls.root, ignore_errors=True)
+
+    def setUp(self):
+        self.application = StaticFilesApplication(
+            self.django_application, root=self.root, prefix='/static/'
+        )
+
+    def django_application(self, environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/html')])
+        return [b'django']
+
+    def request(self, path, **headers):
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path}
+        environ.update(headers)
+        response = {}
+
+        def start_response(status, headers):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        response['body'] = b''.join(self.application(environ, start_response))
+        return response
+
+    def test_collectstatic_writes_compressed_variants(self):
+        """collectstatic сохраняет gzip- и brotli-версии файла."""
+        path = os.path.join(self.root, self.hashed_name)
+        with gzip.open(path + '.gz') as compressed:
+            self.assertEqual(compressed.read().decode(), CSS)
+        with open(path + '.br', 'rb') as compressed:
+            self.assertEqual(
+                brotli.decompress(compressed.read()).decode(), CSS
+            )
+
+    def test_hashed_file_is_immutable_and_compressed(self):
+        """Хэшированный файл отдаётся сжатым с бессрочным кэшем."""
+        response = self.request(
+            '/static/' + self.hashed_name, HTTP_ACCEPT_ENCODING='gzip, br'
+        )
+        self.assertEqual(response['status'], '200 OK')
+        self.assertEqual(
+            response['headers']['Cache-Control'], IMMUTABLE_CACHE_CONTROL
+        )
+        self.assertEqual(response['headers']['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response['body']).decode(), CSS)
+        response = self.request(
+            '/static/' + self.hashed_name, HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response['body']).decode(), CSS)
+
+    def test_etag_revalidation(self):
+        """Совпавший ETag даёт ответ 304 без тела."""
+        path = '/static/css/site.css'
+        etag = self.request(path)['headers']['ETag']
+        response = self.request(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response['status'], '304 Not Modified')
+        self.assertEqual(response['body'], b'')
+
+    def test_each_encoding_has_own_etag(self):
+        """У несжатой и сжатой версии разные ETag."""
+        path = '/static/' + self.hashed_name
+        plain = self.request(path)['headers']['ETag']
+        compressed = self.request(path, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotEqual(compressed['headers']['ETag'], plain)
+        response = self.request(
+            path, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=plain
+        )
+        self.assertEqual(response['status'], '200 OK')
+
+    def test_zero_quality_encoding_refused(self):
+        """Кодировка с q=0 не используется."""
+        response = self.request(
+            '/static/' + self.hashed_name,
+            HTTP_ACCEPT_ENCODING='gzip;q=0, identity'
+        )
+        self.assertNotIn('Content-Encoding', response['headers'])
+        self.assertEqual(response['body'].decode(), CSS)
+
+    def test_other_paths_reach_django(self):
+        """Запросы не к статике передаются приложению Django."""
+        self.assertEqual(self.request('/about/author/')['body'], b'django')
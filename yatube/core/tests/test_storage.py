@@ -0,0 +1,52 @@
+from django.core.files.base import ContentFile
+from django.test import TestCase
+
+from posts.models import Post, User
+
+from ..storage import InMemoryStorage
+from ..testing import Snapshot
+
+
+def build_snapshot():
+    author = User(id=10, username='author')
+    return {
+        'author': author,
+        'posts': [
+            Post(id=number, text=f'Пост {number}', author=author)
+            for number in range(1, 4)
+        ],
+    }
+
+
+class InMemoryStorageTests(TestCase):
+    def tearDown(self):
+        InMemoryStorage.clear()
+
+    def test_files_shared_between_instances(self):
+        """Файл, сохранённый одним экземпляром, виден другому."""
+        name = InMemoryStorage().save('posts/a.txt', ContentFile(b'data'))
+        storage = InMemoryStorage()
+        self.assertTrue(storage.exists(name))
+        self.assertEqual(storage.open(name).read(), b'data')
+        self.assertEqual(storage.size(name), 4)
+        self.assertEqual(storage.listdir('posts'), ([], ['a.txt']))
+        self.assertEqual(storage.url(name), '/media/posts/a.txt')
+        storage.delete(name)
+        self.assertFalse(InMemoryStorage().exists(name))
+
+    def test_default_storage_in_tests(self):
+        """В тестах поля моделей пишут файлы в память."""
+        post = Post(author=User(username='author'))
+        post.image.save('small.gif', ContentFile(b'GIF89a'), save=False)
+        self.assertTrue(InMemoryStorage().exists(post.image.name))
+
+
+class SnapshotTests(TestCase):
+    snapshot = Snapshot(build_snapshot)
+
+    def test_loaded_with_one_query_per_model(self):
+        """Снимок вставляется одним запросом на модель."""
+        with self.assertNumQueries(2):
+            loaded = self.snapshot.load()
+        self.assertEqual(loaded['author'].posts.count(), 3)
+        self.assertEqual(len(loaded['posts']), 3)
@@ -0,0 +1,109 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from ..surrogate import (
+    PurgeDispatcher, SurrogateMiddleware, edge_cache, send_purge,
+    set_surrogate_keys,
+)
+
+
+class PurgeHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.server.purged.append(self.headers['Surrogate-Key'])
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PurgeServer:
+    """Локальная замена CDN, записывающая запросы на сброс."""
+
+    def __enter__(self):
+        self.server = HTTPServer(('127.0.0.1', 0), PurgeHandler)
+        self.server.purged = []
+        threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        ).start()
+        host, port = self.server.server_address
+        self.url = f'http://{host}:{port}/purge'
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def purged(self):
+        return self.server.purged
+
+
+@edge_cache
+def page(request):
+    response = HttpResponse('Страница')
+    response['Vary'] = 'Cookie, Accept-Encoding'
+    return set_surrogate_keys(response, ['post-1', 'author-2', 'post-1'])
+
+
+class EdgeCacheTests(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+
+    def test_anonymous_response_cached_on_edge(self):
+        """Анонимный ответ получает заголовки CDN и ключи."""
+        self.request.user = AnonymousUser()
+        response = SurrogateMiddleware(page)(self.request)
+        self.assertEqual(response['Surrogate-Key'], 'author-2 post-1')
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=0', response['Cache-Control'])
+        self.assertEqual(response['Surrogate-Control'], 'max-age=86400')
+        self.assertEqual(response['Vary'], 'Cookie, Accept-Encoding')
+
+    def test_user_response_private(self):
+        """Ответ вошедшему пользователю CDN не сохраняет."""
+        self.request.user = User(username='user')
+        response = SurrogateMiddleware(page)(self.request)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertFalse(response.has_header('Surrogate-Control'))
+
+    def test_response_with_cookie_not_cached(self):
+        """Ответ, ставящий cookie, CDN не сохраняет."""
+        def page_with_cookie(request):
+            response = page(request)
+            response.set_cookie('csrftoken', 'token')
+            return response
+        self.request.user = AnonymousUser()
+        response = SurrogateMiddleware(page_with_cookie)(self.request)
+        self.assertFalse(response.has_header('Surrogate-Control'))
+        self.assertIn('private', response['Cache-Control'])
+
+
+class SendPurgeTests(TestCase):
+    def test_keys_sent_in_batches(self):
+        """Ключи без повторов уходят пачками не больше заданной."""
+        with PurgeServer() as server, override_settings(
+            SURROGATE_PURGE_URL=server.url, SURROGATE_PURGE_BATCH=2
+        ):
+            send_purge([{'post-1', 'group-1'}, {'post-1', 'feed'}])
+        self.assertEqual(server.purged, ['feed group-1', 'post-1'])
+
+    def test_dispatcher_waits_for_pause(self):
+        """Частые изменения уходят одним запросом после паузы."""
+        with PurgeServer() as server, override_settings(
+            SURROGATE_PURGE_URL=server.url
+        ):
+            dispatcher = PurgeDispatcher(
+                send_purge, max_delay=5, interval=0.2, background=True
+            )
+            for number in range(3):
+                dispatcher.add({f'post-{number}'})
+            time.sleep(0.1)
+            self.assertEqual(server.purged, [])
+            time.sleep(0.5)
+        self.assertEqual(server.purged, ['post-0 post-1 post-2'])
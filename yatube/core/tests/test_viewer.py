@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from posts.models import Follow, Group, Post
+
+from ..context_processors.viewer import get_viewer
+
+User = get_user_model()
+
+LOOP = Template(
+    '{% load viewer %}{% for post in posts %}'
+    '{% if post|editable_by:viewer %}E{% endif %}'
+    '{% if post.author|followed_by:viewer %}F{% endif %}'
+    '{% endfor %}'
+)
+
+
+class ViewerTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        Post.objects.bulk_create([
+            Post(text='Свой пост', author=cls.reader, group=cls.group),
+            Post(text='Пост автора', author=cls.author, group=cls.group),
+            Post(text='Ещё пост автора', author=cls.author, group=cls.group),
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.posts = list(Post.objects.select_related('author'))
+
+    def render(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return LOOP.render(Context({
+            'posts': self.posts, 'viewer': get_viewer(request)
+        }))
+
+    def test_loop_costs_one_query(self):
+        """Права на все посты страницы считаются одним запросом."""
+        with self.assertNumQueries(1):
+            self.assertEqual(sorted(self.render(self.reader)), list('EFF'))
+
+    def test_anonymous_costs_no_queries(self):
+        """Для гостя права не требуют запросов."""
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render(AnonymousUser()), '')
+
+    def test_feed_shows_controls(self):
+        """Лента группы показывает ссылку на правку своего поста."""
+        self.client.force_login(self.reader)
+        response = self.client.get(
+            reverse('posts:group_list', kwargs={'slug': self.group.slug})
+        )
+        self.assertContains(response, 'редактировать запись', count=1)
+        self.assertContains(response, 'Вы подписаны на автора', count=2)
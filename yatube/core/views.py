@@ -1,9 +1,75 @@
+import os
+from concurrent.futures import TimeoutError as ResizeTimeout
+
+from django.conf import settings
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotModified,
+)
 from django.shortcuts import render
+from django.utils.cache import patch_cache_control
+
+from .errors import is_anonymous, prerendered, record_missing
+from .images import FORMATS, ImageBusy, resized_path, verify
+
+
+IMAGE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def error_page(request, template_name, status, context=None):
+    """Страница ошибки, для анонимов без сессии — заранее готовая."""
+    if settings.ERROR_PAGES_PRERENDERED and is_anonymous(request):
+        return HttpResponse(prerendered(template_name), status=status)
+    return render(request, template_name, context, status=status)
 
 
 def page_not_found(request, exception):
-    return render(request, 'core/404.html', {'path': request.path}, status=404)
+    record_missing(request.path)
+    return error_page(request, 'core/404.html', 404, {'path': request.path})
+
+
+def permission_denied(request, exception):
+    return error_page(request, 'core/403.html', 403)
 
 
 def csrf_failure(request, reason=''):
-    return render(request, 'core/403csrf.html')
+    return error_page(request, 'core/403csrf.html', 403)
+
+
+def fragment(request, name):
+    """Блок страницы для текущего пользователя, см. templatetags.fragments.
+
+    Активный пункт меню определяется по имени страницы из ?view=,
+    остальные параметры адреса попадают в `params`.
+    """
+    if name not in settings.FRAGMENTS:
+        raise Http404
+    params = request.GET.dict()
+    context = {'view_name': params.pop('view', ''), 'params': params}
+    response = render(request, settings.FRAGMENTS[name], context)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def resized_image(request, signature, width, height, extension, name):
+    """Копия картинки по подписанному адресу, см. core.images."""
+    if not verify(signature, name, width, height, extension):
+        raise Http404
+    try:
+        path = resized_path(name, width, height, extension)
+    except (ImageBusy, ResizeTimeout):
+        response = HttpResponse(status=503)
+        response['Retry-After'] = 1
+        return response
+    except OSError:
+        # Исходника нет или это не картинка.
+        raise Http404
+    etag = f'"{os.path.basename(path)}"'
+    if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(
+            open(path, 'rb'), content_type=FORMATS[extension][1]
+        )
+    response['ETag'] = etag
+    response['Cache-Control'] = IMAGE_CACHE_CONTROL
+    return response
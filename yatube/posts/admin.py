@@ -1,15 +1,19 @@
 from django.contrib import admin
 
-from .models import Post, Group
+from .models import DigestSubscription, Post, Group
 
 
 class PostAdmin (admin.ModelAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group')
     list_editable = ('group',)
     search_fields = ['text', ]
-    list_filter = ['pub_date', ]
+    list_filter = ['pub_date', 'deleted_at']
     empty_value_display = '-пусто-'
 
+    def get_queryset(self, request):
+        return Post.all_objects.select_related('author', 'group')
+
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group)
+admin.site.register(DigestSubscription)
@@ -0,0 +1,111 @@
+"""Перенос старых и удалённых постов в архивные таблицы.
+
+Посты переносятся порциями, каждая в своей транзакции, поэтому
+прерванную архивацию можно продолжить повторным запуском.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .caching import invalidate_index_feed
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+
+
+ARCHIVE_BATCH_SIZE = 500
+
+
+def archivable_posts(cutoff):
+    return Post.all_objects.filter(
+        Q(pub_date__lt=cutoff) | Q(deleted_at__isnull=False)
+    )
+
+
+def archive_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """Переносит в архив одну порцию постов с комментариями."""
+    with transaction.atomic():
+        posts = list(
+            archivable_posts(cutoff).order_by('id')[:batch_size]
+        )
+        if not posts:
+            return 0
+        ArchivedPost.objects.bulk_create([
+            ArchivedPost(
+                id=post.id,
+                text=post.text,
+                author_id=post.author_id,
+                group_id=post.group_id,
+                image=post.image.name,
+                views=post.views,
+                pub_date=post.pub_date,
+                deleted_at=post.deleted_at,
+            )
+            for post in posts
+        ])
+        ArchivedComment.objects.bulk_create([
+            ArchivedComment(
+                id=comment.id,
+                post_id=comment.post_id,
+                author_id=comment.author_id,
+                text=comment.text,
+                pub_date=comment.pub_date,
+            )
+            for comment in Comment.objects.filter(post__in=posts)
+        ])
+        Post.all_objects.filter(id__in=[post.id for post in posts]).delete()
+        # Перенесённые посты уходят с главной.
+        transaction.on_commit(invalidate_index_feed)
+    return len(posts)
+
+
+def archive_posts(days, batch_size=ARCHIVE_BATCH_SIZE):
+    cutoff = timezone.now() - timedelta(days=days)
+    archived = 0
+    while True:
+        count = archive_batch(cutoff, batch_size)
+        if not count:
+            return archived
+        archived += count
+
+
+class ChainedFeed:
+    """Лента из нескольких querysets подряд для пагинатора.
+
+    Позволяет показывать рабочие посты, а за ними архивные, не
+    объединяя таблицы в одном запросе.
+    """
+    ordered = True
+
+    def __init__(self, *querysets):
+        self.querysets = querysets
+        self._counts = {}
+
+    def _count(self, position):
+        if position not in self._counts:
+            self._counts[position] = self.querysets[position].count()
+        return self._counts[position]
+
+    def count(self):
+        return sum(self._count(position)
+                   for position in range(len(self.querysets)))
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        start, stop = index.start or 0, index.stop
+        items = []
+        for position, queryset in enumerate(self.querysets):
+            if stop <= 0:
+                break
+            chunk = list(queryset[start:stop])
+            items.extend(chunk)
+            if len(chunk) == stop - start:
+                break
+            # Срез короче запрошенного: дальше читаем следующий queryset,
+            # а COUNT нужен, только если срез этого оказался пустым.
+            size = start + len(chunk) if chunk else self._count(position)
+            start = max(start - size, 0)
+            stop -= size
+        return items
@@ -0,0 +1,90 @@
+"""Ключи кэша лент и CDN и их сброс.
+
+У каждой группы своя версия ленты: при изменении поста сбрасывается
+версия только затронутых групп, и закэшированные страницы остальных
+групп продолжают работать. Так же устроена версия главной: она входит
+в ключ cache_page и меняется при сохранении любого поста.
+"""
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.views.decorators.cache import cache_page
+
+
+FEED_CACHE_TIMEOUT = 60 * 20
+GROUP_DIRECTORY_KEY = 'groups:directory'
+INDEX_COUNT_KEY = 'post-count:index'
+INDEX_VERSION_KEY = 'index-feed:version'
+
+
+def _version(key):
+    return cache.get_or_set(key, int(time.time()), None)
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Версии нет в кэше: новая будет отличаться от старых ключей.
+        cache.set(key, int(time.time()), None)
+
+
+def _group_version_key(group_id):
+    return f'group-feed:{group_id}:version'
+
+
+def group_feed_key(group_id):
+    version = _version(_group_version_key(group_id))
+    return f'group-feed:{group_id}:v{version}'
+
+
+def invalidate_group_feed(group_id):
+    _bump_version(_group_version_key(group_id))
+
+
+def index_key_prefix():
+    return f'index-feed:v{_version(INDEX_VERSION_KEY)}'
+
+
+def invalidate_index_feed():
+    _bump_version(INDEX_VERSION_KEY)
+
+
+def versioned_cache_page(timeout, key_prefix):
+    """cache_page, у которого префикс ключа считается на каждый запрос.
+
+    key_prefix — функция без аргументов; смена её значения делает
+    старые закэшированные ответы недоступными.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            cached_view = cache_page(timeout, key_prefix=key_prefix())(
+                view_func
+            )
+            return cached_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def invalidate_group_directory():
+    cache.delete(GROUP_DIRECTORY_KEY)
+
+
+def profile_count_key(author_id):
+    return f'post-count:profile:{author_id}'
+
+
+def post_surrogate_keys(post, group_ids=()):
+    """Ключи CDN страниц, на которых виден пост."""
+    keys = {f'post-{post.id}', f'author-{post.author_id}'}
+    keys.update(
+        f'group-{group_id}'
+        for group_id in {post.group_id, *group_ids} - {None}
+    )
+    return keys
+
+
+def page_surrogate_keys(posts, *keys):
+    return set(keys).union(*(post_surrogate_keys(post) for post in posts))
@@ -0,0 +1,101 @@
+"""Дайджесты новых постов от избранных авторов.
+
+Подписчики обрабатываются порциями. Для каждой порции новые посты
+выбираются одним запросом по Follow и Post, письма формируются при
+потоковом чтении результата и передаются почтовому бэкенду одной
+пачкой. Отметка о дайджесте ставится в той же транзакции, поэтому
+прерванный запуск можно просто повторить.
+"""
+from datetime import timedelta
+from itertools import groupby, islice
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import DigestSubscription, Post
+
+
+DIGEST_CHUNK_SIZE = 500
+DIGEST_MAX_POSTS = 20
+PERIODS = {
+    DigestSubscription.DAILY: timedelta(days=1),
+    DigestSubscription.WEEKLY: timedelta(weeks=1),
+}
+
+
+def due_subscriptions(period, now):
+    return DigestSubscription.objects.filter(
+        period=period,
+        last_sent_at__lte=now - PERIODS[period],
+    ).select_related('user').order_by('user_id')
+
+
+def new_posts(user_ids, until):
+    """Новые посты избранных авторов для всех пользователей порции."""
+    return Post.objects.filter(
+        author__following__user__in=user_ids,
+        pub_date__gt=F('author__following__user__digest__last_sent_at'),
+        pub_date__lte=until,
+    ).annotate(
+        follower_id=F('author__following__user'),
+    ).select_related('author', 'group').order_by('follower_id', '-pub_date')
+
+
+def render_digest(user, posts, total):
+    context = {
+        'user': user,
+        'posts': posts,
+        'more': total - len(posts),
+        'site_url': settings.SITE_URL,
+    }
+    return EmailMessage(
+        subject=render_to_string(
+            'posts/email/digest_subject.txt', context
+        ).strip(),
+        body=render_to_string('posts/email/digest.txt', context),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+
+
+def _digest_messages(subscriptions, now):
+    by_user = {
+        subscription.user_id: subscription for subscription in subscriptions
+    }
+    posts = new_posts(list(by_user), now).iterator(
+        chunk_size=DIGEST_CHUNK_SIZE
+    )
+    for user_id, user_posts in groupby(posts, key=attrgetter('follower_id')):
+        user = by_user[user_id].user
+        selected = list(islice(user_posts, DIGEST_MAX_POSTS))
+        total = len(selected) + sum(1 for _ in user_posts)
+        if user.email:
+            yield render_digest(user, selected, total)
+
+
+def send_digests(period, chunk_size=DIGEST_CHUNK_SIZE, now=None):
+    """Рассылает дайджесты за период и возвращает число писем."""
+    now = now or timezone.now()
+    connection = get_connection()
+    sent = 0
+    last_user_id = 0
+    while True:
+        subscriptions = list(due_subscriptions(period, now).filter(
+            user_id__gt=last_user_id
+        )[:chunk_size])
+        if not subscriptions:
+            return sent
+        messages = list(_digest_messages(subscriptions, now))
+        with transaction.atomic():
+            if messages:
+                connection.send_messages(messages)
+            DigestSubscription.objects.filter(
+                id__in=[subscription.id for subscription in subscriptions]
+            ).update(last_sent_at=now)
+        sent += len(messages)
+        last_user_id = subscriptions[-1].user_id
@@ -0,0 +1,136 @@
+"""Брокер событий о новых постах для server-sent events.
+
+Брокер хранит короткую историю событий «автор опубликовал пост».
+Хранилище подключается через настройку POST_EVENTS_BACKEND:
+CacheBackend нумерует события в общем кэше, и номер со страницы,
+отрендеренной одним воркером, понятен любому другому. LocalBackend
+годится только для одного процесса.
+
+По умолчанию (POST_EVENTS_STREAM_DURATION = 0) ответ проверяет
+события один раз и закрывается, а браузер переподключается через
+RECONNECT_DELAY_MS: это короткий опрос, и синхронный воркер не занят
+ожиданием. Держать поток открытым стоит только с воркерами, которые
+переносят долгие соединения (gunicorn --worker-class gthread или
+gevent), иначе каждая вкладка занимает воркер целиком.
+"""
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from core.locks import cache_lock
+
+
+EVENTS_HISTORY_SIZE = 1000
+KEEPALIVE_INTERVAL = 10
+RECONNECT_DELAY_MS = 5000
+
+
+class LocalBackend:
+    """События в памяти процесса."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._events = deque(maxlen=EVENTS_HISTORY_SIZE)
+        self._last_id = 0
+
+    def publish(self, author_id):
+        with self._condition:
+            self._last_id += 1
+            self._events.append((self._last_id, author_id))
+            self._condition.notify_all()
+
+    def last_id(self):
+        return self._last_id
+
+    def events_since(self, event_id):
+        with self._condition:
+            return [event for event in self._events if event[0] > event_id]
+
+    def wait(self, event_id, timeout):
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._last_id > event_id, timeout
+            )
+
+
+class CacheBackend:
+    """События в общем кэше; ожидание сделано опросом кэша."""
+
+    EVENTS_KEY = 'post-events'
+    LAST_ID_KEY = 'post-events:last-id'
+    LOCK_KEY = 'post-events:lock'
+    POLL_INTERVAL = 1
+
+    def publish(self, author_id):
+        # Без блокировки параллельные публикации перезаписывают список
+        # друг друга, и события теряются.
+        with cache_lock(self.LOCK_KEY):
+            cache.add(self.LAST_ID_KEY, 0, None)
+            event_id = cache.incr(self.LAST_ID_KEY)
+            events = cache.get(self.EVENTS_KEY, [])
+            events.append((event_id, author_id))
+            cache.set(self.EVENTS_KEY, events[-EVENTS_HISTORY_SIZE:], None)
+
+    def last_id(self):
+        return cache.get(self.LAST_ID_KEY, 0)
+
+    def events_since(self, event_id):
+        return [
+            event for event in cache.get(self.EVENTS_KEY, [])
+            if event[0] > event_id
+        ]
+
+    def wait(self, event_id, timeout):
+        deadline = time.monotonic() + timeout
+        while self.last_id() <= event_id and time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+
+
+class Broker:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def publish(self, post):
+        self.backend.publish(post.author_id)
+
+    def last_id(self):
+        return self.backend.last_id()
+
+    def stream(self, since, author_ids=None, duration=None):
+        """Генерирует SSE-сообщения о числе новых постов.
+
+        Если задан `author_ids`, учитываются только посты этих авторов.
+        События проверяются сразу и затем `duration` секунд.
+        """
+        if duration is None:
+            duration = settings.POST_EVENTS_STREAM_DURATION
+        yield f'retry: {RECONNECT_DELAY_MS}\n\n'
+        deadline = time.monotonic() + duration
+        while True:
+            events = self.backend.events_since(since)
+            if events:
+                since = events[-1][0]
+                count = sum(
+                    1 for _, author_id in events
+                    if author_ids is None or author_id in author_ids
+                )
+                # Номер отправляется и без данных, чтобы после
+                # переподключения не разбирать те же события.
+                yield (
+                    f'id: {since}\nevent: new_posts\n'
+                    f'data: {{"count": {count}}}\n\n'
+                    if count else f'id: {since}\n\n'
+                )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if not events:
+                yield ': keepalive\n\n'
+            self.backend.wait(since, min(KEEPALIVE_INTERVAL, remaining))
+
+
+broker = Broker(import_string(settings.POST_EVENTS_BACKEND)())
@@ -0,0 +1,50 @@
+"""Адаптивные версии картинок постов.
+
+Для каждой картинки выводятся копии нескольких ширин в базовом
+формате и в современных форматах, которые умеет сохранять Pillow.
+Копии строит core.images по подписанным адресам при первом запросе
+браузера, поэтому показ страницы не обращается ни к движку превью,
+ни к его хранилищу в базе.
+"""
+from core.images import FORMATS, image_url, supported_formats
+
+
+IMAGE_WIDTHS = (480, 960, 1440)
+IMAGE_RATIO = 339 / 960
+DEFAULT_WIDTH = 960
+FALLBACK_FORMAT = 'jpeg'
+
+
+def modern_formats():
+    return [
+        extension for extension in supported_formats()
+        if extension != FALLBACK_FORMAT
+    ]
+
+
+def _srcset(name, extension):
+    return ', '.join(
+        f'{image_url(name, width, round(width * IMAGE_RATIO), extension)} '
+        f'{width}w'
+        for width in IMAGE_WIDTHS
+    )
+
+
+def image_variants(image):
+    """Возвращает адреса версий картинки для тега <picture>."""
+    if not image:
+        return {}
+    height = round(DEFAULT_WIDTH * IMAGE_RATIO)
+    return {
+        'src': image_url(image.name, DEFAULT_WIDTH, height, FALLBACK_FORMAT),
+        'width': DEFAULT_WIDTH,
+        'height': height,
+        'srcset': _srcset(image.name, FALLBACK_FORMAT),
+        'sources': [
+            {
+                'type': FORMATS[extension][1],
+                'srcset': _srcset(image.name, extension),
+            }
+            for extension in modern_formats()
+        ],
+    }
@@ -0,0 +1,93 @@
+"""Кэш поиска автора, группы и поста по адресу.
+
+Найденная запись хранится LOOKUP_HIT_TIMEOUT секунд, и частые
+страницы получают её без обращения к базе. Несуществующий username,
+slug или id запоминается на LOOKUP_MISS_TIMEOUT секунд, и повторные
+запросы ботов и старых ссылок получают 404 тоже без базы. Ключи
+снимаются сигналами при изменении записей, см. posts.signals.
+
+Значение из адреса попадает в ключ кэша хэшем: боты присылают
+строки любой длины с пробелами и не-ASCII, а memcached такие ключи
+не принимает.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from .models import Group, Post, User
+
+
+# Поля автора и группы, которые видны в закэшированных постах.
+AUTHOR_FIELDS = ('username', 'first_name', 'last_name')
+GROUP_FIELDS = ('slug', 'title')
+# Пользователь попадает в общий кэш только с полями для страниц:
+# без хэша пароля, почты и флагов прав.
+PRIVATE_USER_FIELDS = tuple(
+    field.name for field in User._meta.concrete_fields
+    if field.name not in ('id', *AUTHOR_FIELDS)
+)
+LOOKUPS = {
+    'user': (User.objects.defer(*PRIVATE_USER_FIELDS), 'username'),
+    'group': (Group.objects, 'slug'),
+    'post': (
+        Post.objects.select_related('author', 'group').defer(
+            *(f'author__{field}' for field in PRIVATE_USER_FIELDS)
+        ),
+        'id'
+    ),
+}
+
+
+def _digest(value):
+    return hashlib.md5(str(value).encode()).hexdigest()
+
+
+def _hit_key(kind, value):
+    return f'lookup:{kind}:{_digest(value)}'
+
+
+def _miss_key(kind, value):
+    return f'lookup-miss:{kind}:{_digest(value)}'
+
+
+def remember_missing(kind, value):
+    if settings.LOOKUP_MISS_TIMEOUT:
+        cache.set(_miss_key(kind, value), True, settings.LOOKUP_MISS_TIMEOUT)
+
+
+def forget(kind, *values):
+    """Снимает и найденные записи, и промахи."""
+    cache.delete_many([
+        key
+        for value in values
+        for key in (_hit_key(kind, value), _miss_key(kind, value))
+    ])
+
+
+def lookup(kind, value):
+    """Запись по полю из LOOKUPS или None, если её нет.
+
+    Для уже запомненного промаха сразу бросает Http404.
+    """
+    hit_key, miss_key = _hit_key(kind, value), _miss_key(kind, value)
+    cached = cache.get_many([hit_key, miss_key])
+    if miss_key in cached:
+        raise Http404
+    if hit_key in cached:
+        return cached[hit_key]
+    queryset, field = LOOKUPS[kind]
+    obj = queryset.filter(**{field: value}).first()
+    if obj is not None and settings.LOOKUP_HIT_TIMEOUT:
+        cache.set(hit_key, obj, settings.LOOKUP_HIT_TIMEOUT)
+    return obj
+
+
+def get_or_404(kind, value):
+    """get_object_or_404 через кэш поиска."""
+    obj = lookup(kind, value)
+    if obj is None:
+        remember_missing(kind, value)
+        raise Http404
+    return obj
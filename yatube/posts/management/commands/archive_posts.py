@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.archive import ARCHIVE_BATCH_SIZE, archive_posts
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые и удалённые посты в архивные таблицы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.POSTS_ARCHIVE_AFTER_DAYS
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=ARCHIVE_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_posts(options['days'], options['batch_size'])
+        self.stdout.write(f'Перенесено в архив постов: {archived}')
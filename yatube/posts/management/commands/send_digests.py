@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts.digest import DIGEST_CHUNK_SIZE, PERIODS, send_digests
+
+
+class Command(BaseCommand):
+    help = 'Рассылает дайджесты новых постов от избранных авторов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', choices=PERIODS, default='daily')
+        parser.add_argument(
+            '--chunk-size', type=int, default=DIGEST_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        sent = send_digests(options['period'], options['chunk_size'])
+        self.stdout.write(f'Отправлено дайджестов: {sent}')
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0011_post_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DigestSubscription',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('daily', 'Ежедневно'), ('weekly', 'Еженедельно')], default='daily', max_length=10, verbose_name='Периодичность')),
+                ('last_sent_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Последний дайджест')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='digest', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 from core.models import CreatedModel
 
@@ -18,6 +19,13 @@ class Group(models.Model):
         return self.title
 
 
+class PostManager(models.Manager):
+    """Посты без мягко удалённых."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Post(CreatedModel):
     text = models.TextField(
         'Текст поста',
@@ -40,6 +48,53 @@ class Post(CreatedModel):
         upload_to='posts/',
         blank=True
     )
+    views = models.PositiveIntegerField(
+        'Просмотры',
+        default=0,
+        editable=False
+    )
+    deleted_at = models.DateTimeField(
+        'Дата удаления',
+        blank=True,
+        null=True,
+        editable=False
+    )
+
+    objects = PostManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        ordering = ['-pub_date']
+
+    def __str__(self):
+        return self.text[:15]
+
+    def soft_delete(self):
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at'])
+
+
+class ArchivedPost(models.Model):
+    """Пост, перенесённый в архив. Сохраняет id исходного поста."""
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField('Текст поста')
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts'
+    )
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts'
+    )
+    image = models.ImageField('Картинка', upload_to='posts/', blank=True)
+    views = models.PositiveIntegerField('Просмотры', default=0)
+    pub_date = models.DateTimeField('Дата создания')
+    deleted_at = models.DateTimeField('Дата удаления', blank=True, null=True)
+    archived_at = models.DateTimeField('Дата архивации', auto_now_add=True)
 
     class Meta:
         ordering = ['-pub_date']
@@ -65,6 +120,22 @@ class Comment(CreatedModel):
     )
 
 
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments'
+    )
+    text = models.TextField('Текст комментария')
+    pub_date = models.DateTimeField('Дата создания')
+
+
 class Follow(CreatedModel):
     user = models.ForeignKey(
         User,
@@ -76,3 +147,29 @@ class Follow(CreatedModel):
         on_delete=models.CASCADE,
         related_name='following'
     )
+
+
+class DigestSubscription(models.Model):
+    """Подписка пользователя на дайджест новых постов."""
+    DAILY = 'daily'
+    WEEKLY = 'weekly'
+    PERIOD_CHOICES = (
+        (DAILY, 'Ежедневно'),
+        (WEEKLY, 'Еженедельно'),
+    )
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='digest'
+    )
+    period = models.CharField(
+        'Периодичность',
+        max_length=10,
+        choices=PERIOD_CHOICES,
+        default=DAILY
+    )
+    last_sent_at = models.DateTimeField(
+        'Последний дайджест',
+        default=timezone.now
+    )
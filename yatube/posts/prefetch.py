@@ -0,0 +1,76 @@
+"""Заранее подготовленные следующие страницы лент.
+
+После ответа со страницей N представление строит страницу N + 1,
+чтобы её записи и сам ответ оказались в кэше к переходу по ссылке
+«Следующая». Одновременно идёт не больше FEED_PREFETCH_WORKERS
+прогревов: если все заняты, сервер нагружен и прогрев пропускается.
+"""
+import copy
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+
+PREFETCH_LOCK_TIMEOUT = 60
+
+_slots = threading.BoundedSemaphore(settings.FEED_PREFETCH_WORKERS)
+
+
+def next_page_url(request, page):
+    if not page.has_next():
+        return None
+    query = request.GET.copy()
+    query['page'] = page.next_page_number()
+    return f'{request.path}?{query.urlencode()}'
+
+
+def _next_page_request(request, page):
+    next_request = copy.copy(request)
+    next_request.GET = request.GET.copy()
+    next_request.GET['page'] = page.next_page_number()
+    next_request.META = {
+        **request.META, 'QUERY_STRING': next_request.GET.urlencode()
+    }
+    next_request.is_prefetch = True
+    return next_request
+
+
+def _render(view, request, args, kwargs):
+    try:
+        view(request, *args, **kwargs)
+    finally:
+        _slots.release()
+
+
+def _render_in_background(view, request, args, kwargs):
+    try:
+        _render(view, request, args, kwargs)
+    finally:
+        connection.close()
+
+
+def prefetch_next_page(request, response, page, view, *args, **kwargs):
+    """Добавляет подсказки браузеру и прогревает следующую страницу."""
+    url = next_page_url(request, page)
+    if url is None or getattr(request, 'is_prefetch', False):
+        return response
+    response['Link'] = f'<{url}>; rel=prefetch'
+    session = request.COOKIES.get(settings.SESSION_COOKIE_NAME, '')
+    if not settings.FEED_PREFETCH_ENABLED or not cache.add(
+        f'feed-prefetch:{session}:{url}', True, PREFETCH_LOCK_TIMEOUT
+    ):
+        return response
+    if not _slots.acquire(blocking=False):
+        return response
+    next_request = _next_page_request(request, page)
+    if settings.FEED_PREFETCH_BACKGROUND:
+        threading.Thread(
+            target=_render_in_background,
+            args=(view, next_request, args, kwargs),
+            daemon=True,
+        ).start()
+    else:
+        _render(view, next_request, args, kwargs)
+    return response
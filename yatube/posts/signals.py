@@ -0,0 +1,130 @@
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_delete,
+)
+from django.dispatch import receiver
+
+from core.surrogate import purge
+
+from .caching import (
+    INDEX_COUNT_KEY, invalidate_group_directory, invalidate_group_feed,
+    invalidate_index_feed, post_surrogate_keys, profile_count_key,
+)
+from .events import broker
+from .lookups import AUTHOR_FIELDS, GROUP_FIELDS, forget
+from .models import Comment, Follow, Group, Post, User
+from .summary import invalidate_author_summary
+from .utils import mark_counts_stale
+
+
+@receiver(post_init, sender=Post)
+def remember_post_group(sender, instance, **kwargs):
+    """Запоминает исходную группу, чтобы заметить перенос поста."""
+    instance._loaded_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_groups(sender, instance, **kwargs):
+    group_ids = {instance._loaded_group_id, instance.group_id}
+    for group_id in group_ids - {None}:
+        invalidate_group_feed(group_id)
+    invalidate_group_directory()
+    purge('feed', *post_surrogate_keys(instance, group_ids))
+    instance._loaded_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Post)
+def invalidate_index(sender, instance, **kwargs):
+    # Вместе со сбросом 'feed' на CDN: иначе CDN перезапросит главную
+    # и снова получит её копию из cache_page. Удалённый пост, как
+    # и прежде, остаётся на главной до истечения кэша.
+    invalidate_index_feed()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_author(sender, instance, **kwargs):
+    invalidate_author_summary(instance.author_id)
+    mark_counts_stale(INDEX_COUNT_KEY, profile_count_key(instance.author_id))
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow_users(sender, instance, **kwargs):
+    invalidate_author_summary(instance.author_id, instance.user_id)
+    purge(f'profile-{instance.author_id}', f'profile-{instance.user_id}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def purge_comment_post(sender, instance, **kwargs):
+    purge(f'post-{instance.post_id}')
+
+
+@receiver(post_save, sender=Post)
+def publish_new_post(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: broker.publish(instance))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group(sender, instance, **kwargs):
+    invalidate_group_feed(instance.id)
+    invalidate_group_directory()
+    purge(f'group-{instance.id}')
+
+
+def _loaded_fields(instance, fields):
+    # Отложенные поля не читаем, чтобы не делать лишних запросов.
+    return tuple(instance.__dict__.get(field) for field in fields)
+
+
+@receiver(post_init, sender=User)
+def remember_author_fields(sender, instance, **kwargs):
+    instance._loaded_author = _loaded_fields(instance, AUTHOR_FIELDS)
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, instance, **kwargs):
+    forget('user', instance._loaded_author[0], instance.username)
+
+
+@receiver(post_save, sender=User)
+def forget_saved_user(sender, instance, created, **kwargs):
+    loaded = instance._loaded_author
+    current = _loaded_fields(instance, AUTHOR_FIELDS)
+    forget('user', *{loaded[0], instance.username} - {None})
+    # Посты автора перечитываются, только если изменилось видное на них,
+    # а не при каждом сохранении, например при входе в систему.
+    if not created and current != loaded:
+        forget('post', *instance.posts.values_list('id', flat=True))
+    instance._loaded_author = current
+
+
+@receiver(post_init, sender=Group)
+def remember_group_fields(sender, instance, **kwargs):
+    instance._loaded_group = _loaded_fields(instance, GROUP_FIELDS)
+
+
+@receiver(pre_delete, sender=Group)
+def forget_deleted_group(sender, instance, **kwargs):
+    forget('group', instance._loaded_group[0], instance.slug)
+    forget('post', *instance.posts.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Group)
+def forget_saved_group(sender, instance, created, **kwargs):
+    loaded = instance._loaded_group
+    current = _loaded_fields(instance, GROUP_FIELDS)
+    forget('group', *{loaded[0], instance.slug} - {None})
+    if not created and current != loaded:
+        forget('post', *instance.posts.values_list('id', flat=True))
+    instance._loaded_group = current
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def forget_post_lookup(sender, instance, **kwargs):
+    forget('post', instance.id)
@@ -0,0 +1,46 @@
+"""Сводка по автору для шапки профиля и страницы поста.
+
+Число постов, подписчиков, подписок и время последней записи
+считаются один раз и хранятся в кэше. Сигналы Post и Follow
+сбрасывают сводку затронутых пользователей, поэтому страницы
+не выполняют агрегирующих запросов при каждом показе.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import ArchivedPost, Follow, Post
+
+
+SUMMARY_TIMEOUT = 60 * 60 * 24
+
+
+def _summary_key(author_id):
+    return f'author-summary:{author_id}'
+
+
+def build_summary(author_id):
+    live = Post.objects.filter(author_id=author_id).aggregate(
+        count=Count('id'), last=Max('pub_date')
+    )
+    archived = ArchivedPost.objects.filter(
+        author_id=author_id, deleted_at__isnull=True
+    ).aggregate(count=Count('id'), last=Max('pub_date'))
+    return {
+        'posts': live['count'] + archived['count'],
+        'last_post_at': live['last'] or archived['last'],
+        'followers': Follow.objects.filter(author_id=author_id).count(),
+        'following': Follow.objects.filter(user_id=author_id).count(),
+    }
+
+
+def author_summary(author_id):
+    key = _summary_key(author_id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_summary(author_id)
+        cache.set(key, summary, SUMMARY_TIMEOUT)
+    return summary
+
+
+def invalidate_author_summary(*author_ids):
+    cache.delete_many([_summary_key(author_id) for author_id in author_ids])
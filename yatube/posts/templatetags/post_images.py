@@ -0,0 +1,16 @@
+from django import template
+
+from ..images import image_variants
+
+register = template.Library()
+
+DEFAULT_SIZES = '(max-width: 960px) 100vw, 960px'
+
+
+@register.inclusion_tag('posts/includes/picture.html')
+def responsive_image(image, sizes=DEFAULT_SIZES, lazy=True):
+    return {
+        'variants': image_variants(image),
+        'sizes': sizes,
+        'lazy': lazy,
+    }
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archive import archive_posts
+from ..models import ArchivedPost, Comment, Post, User
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.old_post = Post.objects.create(
+            text='Старый пост',
+            author=cls.author,
+        )
+        Post.objects.filter(id=cls.old_post.id).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        Comment.objects.create(
+            post=cls.old_post,
+            author=cls.author,
+            text='Старый комментарий',
+        )
+        cls.fresh_post = Post.objects.create(
+            text='Свежий пост',
+            author=cls.author,
+        )
+        cls.deleted_post = Post.objects.create(
+            text='Удалённый пост',
+            author=cls.author,
+        )
+        cls.deleted_post.soft_delete()
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_soft_deleted_post_hidden(self):
+        """Мягко удалённый пост не виден в ленте и по ссылке."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertNotIn(self.deleted_post, response.context['page_obj'])
+        response = self.guest_client.get(reverse(
+            'posts:post_detail', kwargs={'post_id': self.deleted_post.id}
+        ))
+        self.assertEqual(response.status_code, 404)
+
+    def test_old_and_deleted_posts_archived_in_batches(self):
+        """Старые и удалённые посты переносятся в архив порциями."""
+        self.assertEqual(archive_posts(days=365, batch_size=1), 2)
+        self.assertEqual(list(Post.all_objects.all()), [self.fresh_post])
+        archived = ArchivedPost.objects.get(id=self.old_post.id)
+        self.assertEqual(
+            [comment.text for comment in archived.comments.all()],
+            ['Старый комментарий']
+        )
+        self.assertEqual(archive_posts(days=365), 0)
+
+    def test_archived_post_served_transparently(self):
+        """Страница поста и профиль читают архив, если поста нет."""
+        archive_posts(days=365)
+        response = self.guest_client.get(reverse(
+            'posts:post_detail', kwargs={'post_id': self.old_post.id}
+        ))
+        self.assertTrue(response.context['archived'])
+        self.assertContains(response, 'Старый комментарий')
+        response = self.guest_client.get(reverse(
+            'posts:post_detail', kwargs={'post_id': self.deleted_post.id}
+        ))
+        self.assertEqual(response.status_code, 404)
+        response = self.guest_client.get(reverse(
+            'posts:profile', kwargs={'username': self.author.username}
+        ))
+        self.assertEqual(
+            [post.text for post in response.context['page_obj']],
+            ['Свежий пост', 'Старый пост']
+        )
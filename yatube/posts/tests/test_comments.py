@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..comments import comments_buffer
+from ..models import Comment, Post, User
+
+
+@override_settings(COMMENTS_BUFFERED=True)
+class BufferedCommentTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        comments_buffer.flush()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.author,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+        self.detail_url = reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.id}
+        )
+
+    def tearDown(self):
+        # Записываем очередь внутри транзакции теста, чтобы её откатить.
+        comments_buffer.flush()
+
+    def add_comments(self, *texts):
+        for text in texts:
+            self.author_client.post(
+                reverse('posts:add_comment', kwargs={'post_id': self.post.id}),
+                data={'text': text},
+            )
+
+    def test_author_sees_own_queued_comment(self):
+        """Автор сразу видит свой комментарий из очереди, другие — нет."""
+        self.add_comments('Первый', 'Второй')
+        self.assertFalse(Comment.objects.exists())
+        response = self.author_client.get(self.detail_url)
+        self.assertEqual(
+            [comment.text for comment in response.context['comments']],
+            ['Первый', 'Второй']
+        )
+        response = self.reader_client.get(self.detail_url)
+        self.assertEqual(response.context['comments'], [])
+
+    def test_queue_flushed_with_one_insert(self):
+        """Очередь записывается одной вставкой после проверки постов."""
+        self.add_comments('Первый', 'Второй')
+        with self.assertNumQueries(2):
+            comments_buffer.flush()
+        self.assertEqual(Comment.objects.count(), 2)
+        response = self.author_client.get(self.detail_url)
+        self.assertEqual(len(response.context['comments']), 2)
+
+    def test_invalid_comment_rejected_synchronously(self):
+        """Пустой комментарий отклоняется сразу и не попадает в очередь."""
+        self.add_comments('')
+        self.assertEqual(comments_buffer.pending(), [])
+
+    def test_comment_to_deleted_post_dropped(self):
+        """Комментарий к удалённому посту не блокирует очередь."""
+        doomed = Post.objects.create(text='Удаляемый', author=self.author)
+        self.author_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': doomed.id}),
+            data={'text': 'Потерянный'},
+        )
+        self.add_comments('Живой')
+        doomed.delete()
+        with self.assertLogs('posts.comments', 'WARNING'):
+            comments_buffer.flush()
+        self.assertEqual(comments_buffer.pending(), [])
+        self.assertEqual(
+            list(Comment.objects.values_list('text', flat=True)), ['Живой']
+        )
@@ -0,0 +1,63 @@
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..counters import flush_views, views_buffer
+from ..models import Post, User
+
+
+class ViewCounterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Просмотры других тестов не должны попасть в посты, которые
+        # получат те же id.
+        views_buffer.clear()
+        cls.author = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.author,
+        )
+        cls.other_post = Post.objects.create(
+            text='Другой текст',
+            author=cls.author,
+        )
+
+    def setUp(self):
+        # Иначе первый просмотр после паузы в `interval` секунд сразу
+        # сбрасывает буфер, и результат зависит от порядка тестов.
+        views_buffer.clear()
+        self.guest_client = Client()
+
+    def test_views_are_buffered_and_shown(self):
+        """Просмотры копятся в буфере и сразу видны на странице."""
+        beacon_url = reverse(
+            'posts:post_view', kwargs={'post_id': self.post.id}
+        )
+        self.guest_client.post(beacon_url)
+        self.guest_client.post(beacon_url)
+        response = self.guest_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        )
+        self.assertEqual(response.context['views'], 2)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 0)
+        views_buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 2)
+
+    def test_flush_is_single_batched_update(self):
+        """Пачка просмотров записывается одним запросом."""
+        with self.assertNumQueries(1):
+            flush_views([self.post.id, self.other_post.id, self.post.id])
+        self.post.refresh_from_db()
+        self.other_post.refresh_from_db()
+        self.assertEqual(self.post.views, 2)
+        self.assertEqual(self.other_post.views, 1)
+
+    def test_beacon_for_missing_post(self):
+        """Маячок не принимает GET и просмотры несуществующих постов."""
+        url = reverse('posts:post_view', kwargs={'post_id': self.post.id})
+        self.assertEqual(self.guest_client.get(url).status_code, 405)
+        url = reverse('posts:post_view', kwargs={'post_id': 10 ** 6})
+        self.assertEqual(self.guest_client.post(url).status_code, 404)
+        self.assertEqual(views_buffer.pending(), [])
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+
+from ..digest import new_posts, send_digests
+from ..models import DigestSubscription, Follow, Post, User
+
+
+class DigestTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(
+            username='reader', email='reader@yatube.ru'
+        )
+        cls.other_reader = User.objects.create_user(
+            username='other', email='other@yatube.ru'
+        )
+        for reader in (cls.reader, cls.other_reader):
+            Follow.objects.create(user=reader, author=cls.author)
+        day_ago = timezone.now() - timedelta(days=1)
+        cls.reader_subscription = DigestSubscription.objects.create(
+            user=cls.reader, last_sent_at=day_ago
+        )
+        cls.other_subscription = DigestSubscription.objects.create(
+            user=cls.other_reader, last_sent_at=day_ago
+        )
+        cls.post = Post.objects.create(text='Свежий пост', author=cls.author)
+
+    def test_new_posts_single_query_for_chunk(self):
+        """Посты для всей порции подписчиков выбираются одним запросом."""
+        with self.assertNumQueries(1):
+            posts = list(new_posts(
+                [self.reader.id, self.other_reader.id], timezone.now()
+            ))
+        self.assertEqual(
+            sorted(post.follower_id for post in posts),
+            sorted([self.reader.id, self.other_reader.id])
+        )
+
+    def test_digest_sent_once_per_period(self):
+        """Дайджест уходит каждому подписчику и не повторяется."""
+        self.assertEqual(send_digests(DigestSubscription.DAILY), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn('Свежий пост', mail.outbox[0].body)
+        self.assertEqual(send_digests(DigestSubscription.DAILY), 0)
+
+    def test_interrupted_run_resumes(self):
+        """Повторный запуск досылает только необработанных подписчиков."""
+        now = timezone.now()
+        self.reader_subscription.last_sent_at = now
+        self.reader_subscription.save()
+        self.assertEqual(
+            send_digests(
+                DigestSubscription.DAILY,
+                chunk_size=1,
+                now=now + timedelta(hours=1)
+            ),
+            1
+        )
+        self.assertEqual(mail.outbox[0].to, [self.other_reader.email])
@@ -0,0 +1,114 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..events import Broker, CacheBackend, LocalBackend, broker
+from ..models import Follow, Post, User
+
+
+class BrokerTests(TestCase):
+    def test_stream_counts_only_selected_authors(self):
+        """Поток считает только посты выбранных авторов."""
+        local_broker = Broker(LocalBackend())
+        local_broker.backend.publish(author_id=1)
+        local_broker.backend.publish(author_id=2)
+        local_broker.backend.publish(author_id=1)
+        messages = list(local_broker.stream(0, author_ids={1}, duration=0.1))
+        self.assertEqual(messages[0], 'retry: 5000\n\n')
+        self.assertIn(
+            'id: 3\nevent: new_posts\ndata: {"count": 2}', messages[1]
+        )
+
+    def test_short_poll_closes_at_once(self):
+        """Без длительности поток проверяет события один раз и закрывается."""
+        local_broker = Broker(LocalBackend())
+        local_broker.backend.publish(author_id=2)
+        self.assertEqual(
+            list(local_broker.stream(0, author_ids={1}, duration=0)),
+            ['retry: 5000\n\n', 'id: 1\n\n']
+        )
+
+
+class CacheBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_publish_keeps_all_events(self):
+        """Параллельные публикации не теряют события друг друга."""
+        backend = CacheBackend()
+        cache_get = LocMemCache.get
+
+        def slow_get(self, *args, **kwargs):
+            # Между чтением и записью списка успевают другие потоки.
+            value = cache_get(self, *args, **kwargs)
+            time.sleep(0.001)
+            return value
+
+        def publish(author_id):
+            for _ in range(20):
+                backend.publish(author_id)
+
+        threads = [
+            threading.Thread(target=publish, args=(author_id,))
+            for author_id in range(4)
+        ]
+        with mock.patch.object(LocMemCache, 'get', slow_get):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        events = backend.events_since(0)
+        self.assertEqual(
+            [event_id for event_id, _ in events], list(range(1, 81))
+        )
+
+
+class PostEventsViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.stranger = User.objects.create_user(username='stranger')
+        cls.follower = User.objects.create_user(username='follower')
+        Follow.objects.create(user=cls.follower, author=cls.author)
+
+    def setUp(self):
+        self.follower_client = Client()
+        self.follower_client.force_login(self.follower)
+
+    def test_post_creation_publishes_event(self):
+        """Создание поста публикует событие после коммита."""
+        since = broker.last_id()
+        with mock.patch(
+            'posts.signals.transaction.on_commit', side_effect=lambda f: f()
+        ):
+            Post.objects.create(text='Новый пост', author=self.author)
+        self.assertEqual(broker.last_id(), since + 1)
+
+    def test_follow_stream_reports_new_posts(self):
+        """Лента подписок получает событие о постах избранных авторов."""
+        since = broker.last_id()
+        broker.publish(Post(author=self.stranger))
+        broker.publish(Post(author=self.author))
+        response = self.follower_client.get(
+            reverse('posts:post_events'), {'scope': 'follow', 'since': since}
+        )
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = iter(response.streaming_content)
+        next(stream)
+        self.assertIn(b'data: {"count": 1}', next(stream))
+        response.close()
+
+    def test_index_reload_after_event_is_fresh(self):
+        """После события главная отдаётся заново с новым номером."""
+        cache.clear()
+        url = reverse('posts:index')
+        self.client.get(url)
+        broker.publish(Post(author=self.author))
+        response = self.client.get(url)
+        self.assertEqual(response.context['events_since'], broker.last_id())
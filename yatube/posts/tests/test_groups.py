@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..caching import group_feed_key
+from ..models import Group, Post, User
+
+
+class GroupCachingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Первая группа',
+            slug='first',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Вторая группа',
+            slug='second',
+            description='Тестовое описание',
+        )
+        cls.idle_group = Group.objects.create(
+            title='Третья группа',
+            slug='third',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_group_directory_shows_counts(self):
+        """Каталог групп показывает число записей и кэшируется."""
+        response = self.guest_client.get(reverse('posts:group_directory'))
+        groups = {group.slug: group for group in response.context['groups']}
+        self.assertEqual(groups['first'].posts_count, 1)
+        self.assertEqual(groups['first'].last_activity, self.post.pub_date)
+        self.assertEqual(groups['second'].posts_count, 0)
+        with self.assertNumQueries(0):
+            self.guest_client.get(reverse('posts:group_directory'))
+
+    def test_group_feed_served_from_cache(self):
+        """Повторный запрос ленты группы не обращается к базе."""
+        url = reverse('posts:group_list', kwargs={'slug': self.group.slug})
+        self.guest_client.get(url)
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(url)
+        self.assertEqual(list(response.context['page_obj']), [self.post])
+
+    def test_moving_post_invalidates_only_affected_groups(self):
+        """Перенос поста сбрасывает кэш старой и новой группы."""
+        keys = {
+            group.slug: group_feed_key(group.id)
+            for group in (self.group, self.other_group, self.idle_group)
+        }
+        self.post.group = self.other_group
+        self.post.save()
+        self.assertNotEqual(group_feed_key(self.group.id), keys['first'])
+        self.assertNotEqual(
+            group_feed_key(self.other_group.id), keys['second']
+        )
+        self.assertEqual(group_feed_key(self.idle_group.id), keys['third'])
+        response = self.guest_client.get(reverse(
+            'posts:group_list', kwargs={'slug': self.other_group.slug}
+        ))
+        self.assertEqual(list(response.context['page_obj']), [self.post])
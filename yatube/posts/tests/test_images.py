@@ -0,0 +1,96 @@
+from io import BytesIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from core.storage import InMemoryStorage
+
+from .. import images
+from ..models import Post, User
+
+
+def make_image():
+    content = BytesIO()
+    Image.new('RGB', (1600, 900), 'red').save(content, 'JPEG')
+    return SimpleUploadedFile(
+        name='big.jpg',
+        content=content.getvalue(),
+        content_type='image/jpeg'
+    )
+
+
+class ResponsiveImageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cache.clear()
+        cls.author = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.author,
+            image=make_image(),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        InMemoryStorage.clear()
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_variants_are_signed_urls(self):
+        """Версии всех ширин — подписанные адреса /img/."""
+        variants = images.image_variants(self.post.image)
+        self.assertEqual(variants['width'], images.DEFAULT_WIDTH)
+        self.assertEqual(
+            variants['srcset'].count('w,'), len(images.IMAGE_WIDTHS) - 1
+        )
+        self.assertTrue(variants['src'].startswith('/img/'))
+
+    def test_page_does_not_resize(self):
+        """Показ страницы не строит копий и не ходит в хранилище sorl."""
+        with mock.patch(
+            'core.images.resize', side_effect=AssertionError
+        ), CaptureQueriesContext(connection) as queries:
+            response = self.guest_client.get(reverse(
+                'posts:post_detail', kwargs={'post_id': self.post.id}
+            ))
+        self.assertFalse(any(
+            'thumbnail_kvstore' in query['sql'] for query in queries
+        ))
+        self.assertContains(response, '<picture>')
+        self.assertContains(response, 'srcset=')
+
+    def test_resized_copy_served_and_cached(self):
+        """Копия строится один раз и отдаётся с долгим кэшем."""
+        url = images.image_variants(self.post.image)['src']
+        response = self.guest_client.get(url)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertIn('immutable', response['Cache-Control'])
+        resized = Image.open(BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(resized.size, (960, 339))
+        with mock.patch('core.images.resize', side_effect=AssertionError):
+            response = self.guest_client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_wrong_signature_rejected(self):
+        """Адрес с чужой подписью или размером не обслуживается."""
+        url = images.image_variants(self.post.image)['src']
+        response = self.guest_client.get(url.replace('960x339', '961x339'))
+        self.assertEqual(response.status_code, 404)
+
+    def test_feed_images_are_lazy(self):
+        """В ленте картинки загружаются лениво."""
+        response = self.guest_client.get(reverse(
+            'posts:profile', kwargs={'username': self.author.username}
+        ))
+        self.assertContains(response, 'loading="lazy"')
@@ -0,0 +1,122 @@
+import warnings
+
+from django.core.cache import CacheKeyWarning, cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..lookups import lookup
+from ..models import Group, Post, User
+
+
+@override_settings(ERROR_PAGES_PRERENDERED=True, LOOKUP_MISS_TIMEOUT=30)
+class LookupCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+
+    def setUp(self):
+        cache.clear()
+
+    def assert_miss_cached(self, url):
+        self.assertEqual(self.client.get(url).status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_missing_username_cached(self):
+        """Повторный запрос несуществующего автора не идёт в базу."""
+        url = reverse('posts:profile', kwargs={'username': 'ghost'})
+        self.assert_miss_cached(url)
+        User.objects.create_user(username='ghost')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_missing_slug_cached(self):
+        """Повторный запрос несуществующей группы не идёт в базу."""
+        url = reverse('posts:group_list', kwargs={'slug': 'ghost'})
+        self.assert_miss_cached(url)
+        Group.objects.create(title='Группа', slug='ghost')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_missing_post_cached(self):
+        """Повторный запрос несуществующего поста не идёт в базу."""
+        post_id = Post.objects.create(text='Пост', author=self.author).id + 1
+        url = reverse('posts:post_detail', kwargs={'post_id': post_id})
+        self.assert_miss_cached(url)
+        Post.objects.create(id=post_id, text='Новый', author=self.author)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(LOOKUP_MISS_TIMEOUT=0)
+    def test_miss_cache_can_be_disabled(self):
+        """При LOOKUP_MISS_TIMEOUT=0 промахи не запоминаются."""
+        url = reverse('posts:profile', kwargs={'username': 'ghost'})
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+    def test_found_records_cached(self):
+        """Повторный поиск автора, группы и поста не идёт в базу."""
+        group = Group.objects.create(title='Группа', slug='group')
+        post = Post.objects.create(
+            text='Пост', author=self.author, group=group
+        )
+        lookups = [('user', 'author'), ('group', 'group'), ('post', post.id)]
+        for kind, value in lookups:
+            lookup(kind, value)
+        with self.assertNumQueries(0):
+            found = [lookup(kind, value) for kind, value in lookups]
+        self.assertEqual(found, [self.author, group, post])
+        self.assertEqual(found[2].author.username, 'author')
+        for user in (found[0], found[2].author):
+            for field in ('password', 'email', 'is_staff'):
+                self.assertNotIn(field, user.__dict__)
+
+    def test_renamed_user_forgotten(self):
+        """Переименование автора снимает кэш по старому и новому имени."""
+        user = User.objects.create_user(username='old')
+        lookup('user', 'old')
+        lookup('user', 'new')
+        user.username = 'new'
+        user.save()
+        self.assertIsNone(lookup('user', 'old'))
+        self.assertEqual(lookup('user', 'new'), user)
+
+    def test_changed_post_and_author_forgotten(self):
+        """Правка поста или его автора сбрасывает закэшированный пост."""
+        post = Post.objects.create(text='Пост', author=self.author)
+        lookup('post', post.id)
+        post.text = 'Исправленный пост'
+        post.save()
+        self.assertEqual(lookup('post', post.id).text, 'Исправленный пост')
+        self.author.first_name = 'Лев'
+        self.author.save()
+        self.assertEqual(lookup('post', post.id).author.first_name, 'Лев')
+
+    def test_deleted_group_forgotten(self):
+        """Удалённая группа больше не находится."""
+        group = Group.objects.create(title='Группа', slug='gone')
+        lookup('group', 'gone')
+        group.delete()
+        self.assertIsNone(lookup('group', 'gone'))
+
+    def test_comment_to_missing_post_cached(self):
+        """Комментарий к несуществующему посту отвечает 404 из кэша."""
+        self.client.force_login(self.author)
+        url = reverse('posts:add_comment', kwargs={'post_id': 999})
+        self.assertEqual(self.client.post(url).status_code, 404)
+        # Только чтение сессии и пользователя для login_required.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.post(url).status_code, 404)
+
+    def test_unsafe_lookup_value_makes_valid_key(self):
+        """Длинные значения с пробелами и не-ASCII дают корректный ключ."""
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            self.assertIsNone(lookup('user', 'бот ' * 100))
+
+    def test_invisible_user_changes_keep_posts(self):
+        """Правка невидимых в постах полей автора не перечитывает посты."""
+        self.author.email = 'author@yatube.ru'
+        with self.assertNumQueries(1):
+            self.author.save()
+        with self.assertNumQueries(1):
+            self.author.save(update_fields=['last_login'])
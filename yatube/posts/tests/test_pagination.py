@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from ..archive import ChainedFeed
+from ..caching import INDEX_COUNT_KEY
+from ..models import Post, User
+from ..utils import FeedPaginator, post_paginator
+
+
+class FeedPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=cls.author)
+            for number in range(15)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/', {'page': 2})
+
+    def test_elided_page_range(self):
+        """Длинная лента выводит только соседние и крайние страницы."""
+        paginator = FeedPaginator(range(1000), 10)
+        ellipsis = FeedPaginator.ELLIPSIS
+        self.assertEqual(
+            list(paginator.get_elided_page_range(50)),
+            [1, ellipsis, 48, 49, 50, 51, 52, ellipsis, 100]
+        )
+        self.assertEqual(
+            list(paginator.get_elided_page_range(2)),
+            [1, 2, 3, 4, ellipsis, 100]
+        )
+        paginator = FeedPaginator(range(30), 10)
+        self.assertEqual(list(paginator.get_elided_page_range(2)), [1, 2, 3])
+
+    def test_count_taken_from_cache(self):
+        """Число постов считается один раз и затем берётся из кэша."""
+        queryset = Post.objects.all()
+        page = post_paginator(queryset, self.request, INDEX_COUNT_KEY)
+        self.assertEqual(page.paginator.count, 15)
+        self.assertEqual(page.elided_page_range, [1, 2])
+        with self.assertNumQueries(1):
+            page = post_paginator(queryset, self.request, INDEX_COUNT_KEY)
+            self.assertEqual(len(page), 5)
+
+    def test_new_post_refreshes_count(self):
+        """Новый пост помечает закэшированное число устаревшим."""
+        queryset = Post.objects.all()
+        post_paginator(queryset, self.request, INDEX_COUNT_KEY)
+        Post.objects.create(text='Новый пост', author=self.author)
+        page = post_paginator(queryset, self.request, INDEX_COUNT_KEY)
+        self.assertEqual(page.paginator.count, 16)
+
+    def test_chained_feed_counts_only_when_needed(self):
+        """Цепочка querysets считает строки, только если срез пуст."""
+        posts = Post.objects.order_by('id')
+        feed = ChainedFeed(posts, posts)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(feed[0:10]), 10)
+        with self.assertNumQueries(2):
+            items = feed[10:20]
+        self.assertEqual(items[5:], list(posts[:5]))
+        with self.assertNumQueries(3):
+            items = feed[20:30]
+        self.assertEqual(items, list(posts[5:15]))
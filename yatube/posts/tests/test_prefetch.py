@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post, User
+from ..utils import POSTS_PER_PAGE
+
+
+@override_settings(FEED_PREFETCH_ENABLED=True)
+class PrefetchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Описание',
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=cls.author, group=cls.group)
+            for number in range(POSTS_PER_PAGE + 3)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_next_page_hints(self):
+        """Лента подсказывает браузеру адрес следующей страницы."""
+        url = reverse('posts:group_list', kwargs={'slug': self.group.slug})
+        response = self.guest_client.get(url)
+        self.assertEqual(response['Link'], f'<{url}?page=2>; rel=prefetch')
+        self.assertContains(response, 'rel="prerender" href="?page=2"')
+        response = self.guest_client.get(url, {'page': 2})
+        self.assertFalse(response.has_header('Link'))
+
+    def test_next_page_served_from_cache(self):
+        """Следующая страница уже лежит в кэше после показа текущей."""
+        url = reverse('posts:group_list', kwargs={'slug': self.group.slug})
+        self.guest_client.get(url)
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(url, {'page': 2})
+        self.assertEqual(len(response.context['page_obj']), 3)
+
+    def test_index_next_page_cached_whole(self):
+        """Следующая страница главной целиком попадает в кэш страниц."""
+        self.guest_client.get(reverse('posts:index'))
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(
+                reverse('posts:index'), {'page': 2}
+            )
+        self.assertContains(response, 'Пост')
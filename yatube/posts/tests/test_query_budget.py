@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.querybudget import QueryBudgetMixin
+
+from ..counters import views_buffer
+from ..models import Comment, Follow, Group, Post, User
+
+
+class PageQueryBudgetTests(QueryBudgetMixin, TestCase):
+    budget_urlconfs = ('posts.urls', 'users.urls')
+    scales = (1, 6)
+    default_query_budget = 8
+    query_budgets = {
+        'posts:profile': 11,
+        'users:login': 2,
+        'users:signup': 2,
+        'users:password_reset_form': 2,
+    }
+
+    def load_data(self, scale):
+        self.viewer = User.objects.create_user(username='viewer')
+        User.objects.bulk_create(
+            User(username=f'author{number}') for number in range(scale)
+        )
+        authors = list(User.objects.filter(username__startswith='author'))
+        Group.objects.bulk_create(
+            Group(title=f'Группа {number}', slug=f'group-{number}')
+            for number in range(scale)
+        )
+        groups = list(Group.objects.all())
+        Post.objects.bulk_create(
+            Post(
+                text=f'Пост {number}',
+                author=authors[number % scale],
+                group=groups[number % scale],
+            )
+            for number in range(scale * 3)
+        )
+        Follow.objects.bulk_create(
+            Follow(user=self.viewer, author=author) for author in authors
+        )
+        post = Post.objects.create(
+            text='Пост читателя', author=self.viewer, group=groups[0]
+        )
+        Comment.objects.bulk_create(
+            Comment(post=post, author=authors[number % scale], text='Текст')
+            for number in range(scale * 3)
+        )
+        return {
+            'username': authors[0].username,
+            'slug': groups[0].slug,
+            'post_id': post.id,
+        }
+
+    def prepare_client(self, client):
+        super().prepare_client(client)
+        views_buffer.flush()
+        client.force_login(self.viewer)
+
+    @classmethod
+    def tearDownClass(cls):
+        views_buffer.flush()
+        cache.clear()
+        super().tearDownClass()
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Post, User
+from ..summary import author_summary
+
+
+class AuthorSummaryTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(text='Первый пост', author=cls.author)
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_summary_cached(self):
+        """Повторное чтение сводки не обращается к базе."""
+        summary = author_summary(self.author.id)
+        self.assertEqual(summary['posts'], 1)
+        self.assertEqual(summary['followers'], 1)
+        self.assertEqual(summary['last_post_at'], self.post.pub_date)
+        self.assertEqual(author_summary(self.reader.id)['following'], 1)
+        with self.assertNumQueries(0):
+            author_summary(self.author.id)
+
+    def test_signals_refresh_summary(self):
+        """Новый пост и отписка обновляют сводку."""
+        author_summary(self.author.id)
+        Post.objects.create(text='Второй пост', author=self.author)
+        Follow.objects.filter(user=self.reader).delete()
+        summary = author_summary(self.author.id)
+        self.assertEqual(summary['posts'], 2)
+        self.assertEqual(summary['followers'], 0)
+
+    def test_pages_show_summary(self):
+        """Профиль и страница поста выводят сводку автора."""
+        response = self.guest_client.get(reverse(
+            'posts:profile', kwargs={'username': self.author.username}
+        ))
+        self.assertContains(response, 'подписчиков: 1')
+        response = self.guest_client.get(reverse(
+            'posts:post_detail', kwargs={'post_id': self.post.id}
+        ))
+        self.assertEqual(response.context['summary']['posts'], 1)
@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from django.test import (
+    Client, TestCase, TransactionTestCase, override_settings,
+)
+from django.urls import reverse
+
+from core.surrogate import purge_buffer
+from core.tests.test_surrogate import PurgeServer
+
+from ..models import Comment, Group, Post, User
+
+
+class SurrogateHeadersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            text='Пост', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def test_post_detail_cached_on_edge(self):
+        """Страница поста хранится на CDN, а просмотры считает маячок."""
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        response = self.guest_client.get(url)
+        self.assertIn('Surrogate-Control', response)
+        self.assertEqual(response['Surrogate-Key'].split(), sorted([
+            f'author-{self.author.id}',
+            f'group-{self.group.id}',
+            f'post-{self.post.id}',
+        ]))
+        beacon_url = reverse(
+            'posts:post_view', kwargs={'post_id': self.post.id}
+        )
+        self.assertContains(response, beacon_url)
+        views = response.context['views']
+        beacon = self.guest_client.post(beacon_url)
+        self.assertEqual(beacon.status_code, 204)
+        self.assertIn('no-cache', beacon['Cache-Control'])
+        response = self.guest_client.get(url)
+        self.assertEqual(response.context['views'], views + 1)
+
+    def test_index_cached_for_anonymous_only(self):
+        """Главная кэшируется на CDN только для анонимов."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertIn('feed', response['Surrogate-Key'].split())
+        # Браузер не должен показать анонимную копию после входа.
+        self.assertIn('Cookie', response['Vary'])
+        self.assertIn('max-age=0', response['Cache-Control'])
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertIn('private', response['Cache-Control'])
+        self.assertContains(response, 'Выйти')
+
+    def test_new_post_on_index_after_purge(self):
+        """Сброс 'feed' на CDN получает главную уже с новым постом."""
+        self.guest_client.get(reverse('posts:index'))
+        post = Post.objects.create(text='Свежий пост', author=self.author)
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Свежий пост')
+        self.assertIn(f'post-{post.id}', response['Surrogate-Key'].split())
+
+
+@override_settings(SURROGATE_PURGE_BATCH=100)
+class PurgeSignalsTests(TransactionTestCase):
+    def setUp(self):
+        purge_buffer.flush()
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def test_changes_purged_in_one_batch(self):
+        """Правки поста, комментария и группы сбрасываются одним запросом."""
+        with PurgeServer() as server, override_settings(
+            SURROGATE_PURGE_URL=server.url
+        ):
+            post = Post.objects.create(
+                text='Пост', author=self.author, group=self.group
+            )
+            Comment.objects.create(post=post, author=self.author, text='Да')
+            self.group.title = 'Новое название'
+            self.group.save()
+            purge_buffer.flush()
+        self.assertEqual(len(server.purged), 1)
+        self.assertEqual(server.purged[0].split(), sorted([
+            'feed',
+            f'author-{self.author.id}',
+            f'group-{self.group.id}',
+            f'post-{post.id}',
+        ]))
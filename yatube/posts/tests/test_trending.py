@@ -0,0 +1,113 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import trending
+from ..models import Post, User
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.quiet_post = Post.objects.create(
+            text='Тихий пост',
+            author=cls.author,
+        )
+        cls.hot_post = Post.objects.create(
+            text='Горячий пост',
+            author=cls.author,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def test_comment_bumps_post_to_top(self):
+        """Комментарий поднимает пост в рейтинге популярных."""
+        trending.record_comment(self.quiet_post.id)
+        self.authorized_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.hot_post.id}),
+            data={'text': 'Комментарий'},
+        )
+        self.authorized_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.hot_post.id}),
+            data={'text': 'Ещё комментарий'},
+        )
+        self.assertEqual(
+            trending.trending_post_ids(),
+            [self.hot_post.id, self.quiet_post.id]
+        )
+
+    def test_sampled_view_is_weighted(self):
+        """Выборочный просмотр учитывается с весом, обратным выборке."""
+        with mock.patch.object(trending.random, 'random', return_value=0):
+            self.guest_client.post(
+                reverse('posts:post_view',
+                        kwargs={'post_id': self.quiet_post.id})
+            )
+        ranking = cache.get(trending.TRENDING_KEY)['ranking']
+        self.assertEqual(
+            ranking,
+            [(self.quiet_post.id,
+              trending.VIEW_WEIGHT / trending.VIEW_SAMPLE_RATE)]
+        )
+
+    def test_scores_decay_with_time(self):
+        """Старые очки затухают вдвое за период полураспада."""
+        with mock.patch.object(trending.time, 'time', return_value=0):
+            trending.bump(self.quiet_post.id, 8)
+        with mock.patch.object(
+            trending.time, 'time', return_value=trending.HALF_LIFE
+        ):
+            trending.bump(self.hot_post.id, 5)
+        ranking = cache.get(trending.TRENDING_KEY)['ranking']
+        self.assertEqual(
+            ranking, [(self.hot_post.id, 5), (self.quiet_post.id, 4)]
+        )
+
+    def test_trending_page_ordered_by_score(self):
+        """Страница популярного показывает посты по убыванию очков."""
+        trending.bump(self.quiet_post.id, 10)
+        trending.bump(self.hot_post.id, 1)
+        response = self.guest_client.get(reverse('posts:trending'))
+        self.assertTemplateUsed(response, 'posts/trending.html')
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [self.quiet_post, self.hot_post]
+        )
+
+    def test_concurrent_bumps_not_lost(self):
+        """Параллельные начисления не затирают очки друг друга."""
+        cache_get = LocMemCache.get
+
+        def slow_get(self, *args, **kwargs):
+            value = cache_get(self, *args, **kwargs)
+            time.sleep(0.001)
+            return value
+
+        def bump(post_id):
+            for _ in range(20):
+                trending.bump(post_id, 1)
+
+        threads = [
+            threading.Thread(target=bump, args=(post_id,))
+            for post_id in (self.quiet_post.id, self.hot_post.id)
+        ]
+        with mock.patch.object(LocMemCache, 'get', slow_get):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        ranking = dict(cache.get(trending.TRENDING_KEY)['ranking'])
+        self.assertEqual(
+            ranking, {self.quiet_post.id: 20, self.hot_post.id: 20}
+        )
@@ -1,35 +1,33 @@
-from django.test import TestCase, Client
+from django.test import Client
 from django.urls import reverse
 
+from core.testing import Snapshot, SnapshotTestCase
+
 from ..models import Group, Post, User
 
 
-class PostURLTests(TestCase):
-    @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-        cls.following = User.objects.create_user(username='Following')
-        cls.follower = User.objects.create_user(username='Follower')
-        cls.follow_post = Post.objects.create(
-            author=cls.following,
-            text='Тестовый текст'
-        )
-        cls.user = User.objects.create_user(
-            username='HasNoName'
-        )
-        cls.author = User.objects.create_user(
-            username='Автор'
-        )
-        cls.group = Group.objects.create(
-            title='Тестовый заголовок',
-            slug='test_slug',
-            description='Тестовое описание',
-        )
-        cls.post = Post.objects.create(
-            text='Тестовый текст',
-            author=cls.author,
-            group=cls.group,
-        )
+def build_url_data():
+    following = User(id=1, username='Following')
+    author = User(id=4, username='Автор')
+    group = Group(
+        id=1,
+        title='Тестовый заголовок',
+        slug='test_slug',
+        description='Тестовое описание',
+    )
+    return {
+        'following': following,
+        'follower': User(id=2, username='Follower'),
+        'follow_post': Post(id=1, author=following, text='Тестовый текст'),
+        'user': User(id=3, username='HasNoName'),
+        'author': author,
+        'group': group,
+        'post': Post(id=2, text='Тестовый текст', author=author, group=group),
+    }
+
+
+class PostURLTests(SnapshotTestCase):
+    snapshot = Snapshot(build_url_data)
 
     def setUp(self):
         self.guest_client = Client()
@@ -1,21 +1,18 @@
-import shutil
-import tempfile
-
 from django import forms
-from django.conf import settings
 from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase, override_settings
+from django.test import Client, TestCase
 from django.urls import reverse
 
+from core.storage import InMemoryStorage
+from core.testing import Snapshot, SnapshotTestCase
+
 from ..models import Group, Follow, Post, User
 from ..utils import POSTS_PER_PAGE
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 POSTS_FOR_TEST = 15
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class ProjectViewTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -54,7 +51,7 @@ class ProjectViewTests(TestCase):
     @classmethod
     def tearDownClass(cls):
         super().tearDownClass()
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        InMemoryStorage.clear()
 
     def setUp(self):
         self.guest_client = Client()
@@ -222,27 +219,32 @@ class ProjectViewTests(TestCase):
         self.assertFalse(posts1 == posts3)
 
 
-class PaginatorViewsTest(TestCase):
-    @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-        cls.user = User.objects.create_user(
-            username='HasNoName'
-        )
-        cls.author = User.objects.create_user(
-            username='Автор'
-        )
-        cls.group = Group.objects.create(
-            title='Тестовый заголовок',
-            slug='test_slug',
-            description='Тестовое описание',
-        )
-        for i in range(POSTS_FOR_TEST):
-            Post.objects.create(
+def build_paginator_data():
+    author = User(id=1, username='Автор')
+    group = Group(
+        id=1,
+        title='Тестовый заголовок',
+        slug='test_slug',
+        description='Тестовое описание',
+    )
+    return {
+        'user': User(id=2, username='HasNoName'),
+        'author': author,
+        'group': group,
+        'posts': [
+            Post(
+                id=i + 1,
                 text=f'Тестовый текст {i}',
-                author=cls.author,
-                group=cls.group,
+                author=author,
+                group=group,
             )
+            for i in range(POSTS_FOR_TEST)
+        ],
+    }
+
+
+class PaginatorViewsTest(SnapshotTestCase):
+    snapshot = Snapshot(build_paginator_data)
 
     def setUp(self):
         self.guest_client = Client()
@@ -266,16 +268,17 @@ class PaginatorViewsTest(TestCase):
                                  POSTS_FOR_TEST - POSTS_PER_PAGE)
 
 
-class FollowTest(TestCase):
-    @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-        cls.following = User.objects.create_user(username='Автор')
-        cls.follower = User.objects.create_user(username='Подписчик')
-        cls.post = Post.objects.create(
-            author=cls.following,
-            text='Тестовый текст'
-        )
+def build_follow_data():
+    following = User(id=1, username='Автор')
+    return {
+        'following': following,
+        'follower': User(id=2, username='Подписчик'),
+        'post': Post(id=1, author=following, text='Тестовый текст'),
+    }
+
+
+class FollowTest(SnapshotTestCase):
+    snapshot = Snapshot(build_follow_data)
 
     def setUp(self):
         self.following_client = Client()
@@ -305,6 +308,18 @@ class FollowTest(TestCase):
         ))
         self.assertEqual(Follow.objects.count(), follower_count - 1)
 
+    def test_profile_shows_following_state(self):
+        """Профиль автора знает, что пользователь на него подписан."""
+        address = reverse(
+            'posts:profile',
+            kwargs={'username': self.following.username}
+        )
+        response = self.follower_client.get(address)
+        self.assertFalse(response.context['following'])
+        Follow.objects.create(user=self.follower, author=self.following)
+        response = self.follower_client.get(address)
+        self.assertTrue(response.context['following'])
+
     def test_new_following_post_display(self):
         """Пост появляется на странице подписчиков."""
         posts = self.post
@@ -0,0 +1,74 @@
+"""Рейтинг популярных постов.
+
+Очки поста затухают экспоненциально со временем. Рейтинг хранится
+в кэше уже отсортированным и пересчитывается только при начислении
+очков, поэтому страница популярного не агрегирует комментарии.
+Начисление идёт под блокировкой в кэше, чтобы параллельные запросы
+не затирали очки друг друга; с несколькими воркерами кэш должен
+быть общим.
+"""
+import random
+import time
+
+from django.core.cache import cache
+
+from core.locks import cache_lock
+
+
+TRENDING_KEY = 'trending:ranking'
+TRENDING_LOCK_KEY = 'trending:lock'
+# Время, за которое очки поста уменьшаются вдвое.
+HALF_LIFE = 60 * 60 * 6
+# Как часто применять затухание к накопленным очкам.
+DECAY_INTERVAL = 60 * 5
+MAX_TRACKED_POSTS = 500
+TRENDING_POSTS = 100
+COMMENT_WEIGHT = 5
+VIEW_WEIGHT = 1
+# Доля просмотров, которые учитываются в рейтинге.
+VIEW_SAMPLE_RATE = 0.1
+
+
+def _load():
+    state = cache.get(TRENDING_KEY)
+    if state is None:
+        state = {'decayed_at': time.time(), 'ranking': []}
+    return state
+
+
+def _decay(state, now):
+    elapsed = now - state['decayed_at']
+    if elapsed < DECAY_INTERVAL:
+        return
+    factor = 0.5 ** (elapsed / HALF_LIFE)
+    state['ranking'] = [
+        (post_id, score * factor) for post_id, score in state['ranking']
+    ]
+    state['decayed_at'] = now
+
+
+def bump(post_id, weight):
+    """Начисляет посту очки и обновляет отсортированный рейтинг."""
+    with cache_lock(TRENDING_LOCK_KEY):
+        state = _load()
+        _decay(state, time.time())
+        scores = dict(state['ranking'])
+        scores[post_id] = scores.get(post_id, 0) + weight
+        state['ranking'] = sorted(
+            scores.items(), key=lambda item: item[1], reverse=True
+        )[:MAX_TRACKED_POSTS]
+        cache.set(TRENDING_KEY, state, None)
+
+
+def record_comment(post_id):
+    bump(post_id, COMMENT_WEIGHT)
+
+
+def record_view(post_id):
+    """Учитывает выборочный просмотр с весом, обратным доле выборки."""
+    if random.random() < VIEW_SAMPLE_RATE:
+        bump(post_id, VIEW_WEIGHT / VIEW_SAMPLE_RATE)
+
+
+def trending_post_ids(limit=TRENDING_POSTS):
+    return [post_id for post_id, _ in _load()['ranking'][:limit]]
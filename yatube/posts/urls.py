@@ -7,9 +7,12 @@ app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('trending/', views.trending, name='trending'),
+    path('groups/', views.group_directory, name='group_directory'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('posts/<int:post_id>/view/', views.post_view, name='post_view'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
     path('posts/<int:post_id>/comment/',
@@ -17,6 +20,7 @@ urlpatterns = [
          name='add_comment'
          ),
     path('follow/', views.follow_index, name='follow_index'),
+    path('events/', views.post_events, name='post_events'),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
@@ -1,10 +1,123 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
 
 
 POSTS_PER_PAGE = 10
+COUNT_CACHE_TIMEOUT = 60 * 60 * 24
+COUNT_REFRESH_INTERVAL = 60
+
+
+def _fresh_key(count_key):
+    return f'{count_key}:fresh'
+
+
+def mark_counts_stale(*count_keys):
+    """Просит пересчитать числа постов, не сбрасывая старые значения."""
+    cache.delete_many([_fresh_key(count_key) for count_key in count_keys])
+
+
+class FeedPaginator(Paginator):
+    """Пагинатор лент с сокращённым списком страниц.
+
+    Если передан count_key, число объектов берётся из кэша. Устаревшее
+    значение пересчитывается в фоне, а до тех пор страницы строятся
+    по старому, поэтому COUNT(*) не выполняется при каждом показе.
+    """
+    ELLIPSIS = '…'
+
+    def __init__(self, object_list, per_page, count_key=None,
+                 count_timeout=COUNT_CACHE_TIMEOUT, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+        self.count_timeout = count_timeout
 
+    def _exact_count(self):
+        return Paginator.count.func(self)
 
-def post_paginator(queryset, request):
-    paginator = Paginator(queryset, POSTS_PER_PAGE)
+    def _refresh_count(self):
+        count = self._exact_count()
+        cache.set(self.count_key, count, self.count_timeout)
+        return count
+
+    def _refresh_in_background(self):
+        def refresh():
+            try:
+                self._refresh_count()
+            finally:
+                connection.close()
+        threading.Thread(target=refresh, daemon=True).start()
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return self._exact_count()
+        fresh_key = _fresh_key(self.count_key)
+        cached = cache.get_many([self.count_key, fresh_key])
+        count = cached.get(self.count_key)
+        if count is None:
+            cache.set(fresh_key, True, COUNT_REFRESH_INTERVAL)
+            return self._refresh_count()
+        if fresh_key not in cached and cache.add(
+            fresh_key, True, COUNT_REFRESH_INTERVAL
+        ):
+            if not settings.POST_COUNT_BACKGROUND_REFRESH:
+                return self._refresh_count()
+            self._refresh_in_background()
+        return count
+
+    def get_elided_page_range(self, number=1, on_each_side=2, on_ends=1):
+        """Номера страниц вокруг текущей и по краям, пропуски — ELLIPSIS."""
+        number = self.validate_number(number)
+        if self.num_pages <= (on_each_side + on_ends) * 2 + 1:
+            yield from self.page_range
+            return
+        if number > 1 + on_each_side + on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < self.num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(
+                self.num_pages - on_ends + 1, self.num_pages + 1
+            )
+        else:
+            yield from range(number + 1, self.num_pages + 1)
+
+    def get_page(self, number):
+        page = super().get_page(number)
+        page.elided_page_range = list(
+            self.get_elided_page_range(page.number)
+        )
+        return page
+
+
+def post_paginator(queryset, request, count_key=None):
+    paginator = FeedPaginator(queryset, POSTS_PER_PAGE, count_key=count_key)
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
+
+
+def cached_post_page(queryset, request, key_prefix, timeout):
+    """Страница ленты, у которой число постов и сами посты в кэше."""
+    paginator = FeedPaginator(
+        queryset,
+        POSTS_PER_PAGE,
+        count_key=f'{key_prefix}:count',
+        count_timeout=timeout,
+    )
+    page = paginator.get_page(request.GET.get('page'))
+    page_key = f'{key_prefix}:page:{page.number}'
+    object_list = cache.get(page_key)
+    if object_list is None:
+        object_list = list(page.object_list)
+        cache.set(page_key, object_list, timeout)
+    page.object_list = object_list
+    return page
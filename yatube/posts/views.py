@@ -1,57 +1,188 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render, get_object_or_404
-from django.views.decorators.cache import cache_page
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 
-from .models import Comment, Follow, Post, Group, User
+from core.context_processors.viewer import get_viewer
+from core.ratelimit import ratelimit
+from core.surrogate import edge_cache, set_surrogate_keys
+
+from .archive import ChainedFeed
+from .models import ArchivedPost, Comment, Follow, Post, Group
+from .caching import (
+    FEED_CACHE_TIMEOUT, GROUP_DIRECTORY_KEY, INDEX_COUNT_KEY, group_feed_key,
+    index_key_prefix, page_surrogate_keys, post_surrogate_keys,
+    profile_count_key, versioned_cache_page,
+)
+from .comments import enqueue_comment, pending_comments
+from .counters import add_view, get_views
+from .events import broker
 from .forms import PostForm, CommentForm
-from .utils import post_paginator
+from .lookups import get_or_404, lookup, remember_missing
+from .prefetch import prefetch_next_page
+from .summary import author_summary
+from .trending import record_comment, record_view, trending_post_ids
+from .utils import cached_post_page, post_paginator
+
 
+def _index_key_prefix():
+    # Номер последнего события в ключе: обновлённая по баннеру «Новых
+    # записей» главная показывает эти записи и новый events_since.
+    return f'{index_key_prefix()}:e{broker.last_id()}'
 
-@cache_page(60 * 20)
+
+@edge_cache(shell=True)
+@versioned_cache_page(60 * 20, _index_key_prefix)
 def index(request):
-    context = {'page_obj': post_paginator(Post.objects.all(), request)}
-    return render(request, 'posts/index.html', context)
+    page_obj = post_paginator(
+        Post.objects.select_related('author', 'group'),
+        request,
+        count_key=INDEX_COUNT_KEY
+    )
+    context = {
+        'page_obj': page_obj,
+        'events_since': broker.last_id(),
+    }
+    response = render(request, 'posts/index.html', context)
+    if settings.FRAGMENTS_MODE == 'inline':
+        # Шапка и переключатель лент вставлены в страницу: кэш по cookie.
+        patch_vary_headers(response, ('Cookie',))
+    set_surrogate_keys(response, page_surrogate_keys(page_obj, 'feed'))
+    return prefetch_next_page(request, response, page_obj, index)
 
 
+@edge_cache(shell=True)
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
+    group = get_or_404('group', slug)
+    page_obj = cached_post_page(
+        group.posts.select_related('author', 'group'),
+        request,
+        group_feed_key(group.id),
+        FEED_CACHE_TIMEOUT
+    )
     context = {
         'group': group,
-        'page_obj': post_paginator(group.posts.all(), request),
+        'page_obj': page_obj,
     }
-    return render(request, 'posts/group_list.html', context)
+    response = render(request, 'posts/group_list.html', context)
+    set_surrogate_keys(
+        response, page_surrogate_keys(page_obj, f'group-{group.id}')
+    )
+    return prefetch_next_page(request, response, page_obj, group_posts, slug)
 
 
-def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    following = request.user.is_authenticated and Follow.objects.filter(
-        user=request.user,
-        author=author
+def group_directory(request):
+    groups = cache.get(GROUP_DIRECTORY_KEY)
+    if groups is None:
+        groups = list(Group.objects.annotate(
+            posts_count=Count('posts'),
+            last_activity=Max('posts__pub_date'),
+        ).order_by('title'))
+        cache.set(GROUP_DIRECTORY_KEY, groups, FEED_CACHE_TIMEOUT)
+    context = {'groups': groups}
+    return render(request, 'posts/group_directory.html', context)
+
+
+def trending(request):
+    page_obj = post_paginator(trending_post_ids(), request)
+    posts = Post.objects.select_related('author', 'group').in_bulk(
+        page_obj.object_list
     )
+    page_obj.object_list = [
+        posts[post_id] for post_id in page_obj.object_list
+        if post_id in posts
+    ]
+    context = {'page_obj': page_obj}
+    return render(request, 'posts/trending.html', context)
+
+
+@edge_cache(shell=True)
+def profile(request, username):
+    author = get_or_404('user', username)
     context = {
         'author': author,
-        'following': following,
+        'following': get_viewer(request).follows(author),
+        'summary': author_summary(author.id),
         'page_obj': post_paginator(
-            author.posts.select_related('author'),
-            request
+            ChainedFeed(
+                author.posts.select_related('author', 'group'),
+                author.archived_posts.filter(
+                    deleted_at__isnull=True
+                ).select_related('author', 'group'),
+            ),
+            request,
+            count_key=profile_count_key(author.id)
         ),
     }
-    return render(request, 'posts/profile.html', context)
+    response = render(request, 'posts/profile.html', context)
+    return set_surrogate_keys(response, page_surrogate_keys(
+        context['page_obj'],
+        f'author-{author.id}',
+        f'profile-{author.id}',
+    ))
+
+
+def archived_post_detail(request, post_id):
+    post = ArchivedPost.objects.select_related('author', 'group').filter(
+        id=post_id,
+        deleted_at__isnull=True
+    ).first()
+    if post is None:
+        remember_missing('post', post_id)
+        raise Http404
+    context = {
+        'post': post,
+        'views': post.views,
+        'summary': author_summary(post.author_id),
+        'comments': post.comments.select_related('author'),
+        'archived': True,
+    }
+    response = render(request, 'posts/post_detail.html', context)
+    return set_surrogate_keys(response, post_surrogate_keys(post))
 
 
+@edge_cache
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = lookup('post', post_id)
+    if post is None:
+        return archived_post_detail(request, post_id)
     form = CommentForm(request.POST or None)
-    comments = Comment.objects.filter(post=post)
+    comments = [
+        *Comment.objects.filter(post=post).select_related('author'),
+        *pending_comments(post.id, request.user),
+    ]
     context = {
         'post': post,
+        'views': get_views(post),
+        'summary': author_summary(post.author_id),
         'form': form,
         'comments': comments,
     }
-    return render(request, 'posts/post_detail.html', context)
+    response = render(request, 'posts/post_detail.html', context)
+    return set_surrogate_keys(response, post_surrogate_keys(post))
+
+
+# Страница поста хранится на CDN, поэтому просмотр считает не она,
+# а этот адрес: страница отправляет на него запрос после загрузки.
+@csrf_exempt
+@require_POST
+@never_cache
+def post_view(request, post_id):
+    """Учитывает просмотр поста в счётчике и в популярном."""
+    post = get_or_404('post', post_id)
+    record_view(post.id)
+    add_view(post.id)
+    return HttpResponse(status=204)
 
 
 @login_required
+@ratelimit('posts:post_create')
 def post_create(request):
     form = PostForm(
         request.POST or None,
@@ -91,32 +222,60 @@ def post_edit(request, post_id):
 
 
 @login_required
+@ratelimit('posts:add_comment')
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    get_or_404('post', post_id)
     form = CommentForm(request.POST or None)
     if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
-        comment.post = post
-        comment.save()
+        comment.post_id = post_id
+        if settings.COMMENTS_BUFFERED:
+            enqueue_comment(comment)
+        else:
+            comment.save()
+        record_comment(post_id)
     return redirect('posts:post_detail', post_id=post_id)
 
 
 @login_required
 def follow_index(request):
     post_list = Post.objects.filter(
-        author__following__user=request.user).select_related('author')
+        author__following__user=request.user
+    ).select_related('author', 'group')
     page_obj = post_paginator(post_list, request)
     context = {
         'page_obj': page_obj,
+        'events_since': broker.last_id(),
     }
     return render(request, 'posts/follow.html', context)
 
 
+def post_events(request):
+    """Поток server-sent events о новых постах в ленте."""
+    author_ids = None
+    if request.GET.get('scope') == 'follow':
+        if not request.user.is_authenticated:
+            return redirect('users:login')
+        author_ids = set(Follow.objects.filter(
+            user=request.user
+        ).values_list('author_id', flat=True))
+    since = request.headers.get('Last-Event-ID') or request.GET.get('since')
+    since = int(since) if since and since.isdigit() else broker.last_id()
+    response = StreamingHttpResponse(
+        broker.stream(since, author_ids),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required
+@ratelimit('posts:profile_follow', methods=('GET', 'POST'))
 def profile_follow(request, username):
     """Подписаться на автора."""
-    author = get_object_or_404(User, username=username)
+    author = get_or_404('user', username)
     if request.user != author:
         Follow.objects.get_or_create(user=request.user, author=author)
     return redirect('posts:profile', username=username)
@@ -125,6 +284,6 @@ def profile_follow(request, username):
 @login_required
 def profile_unfollow(request, username):
     """Отписаться от автора."""
-    author = get_object_or_404(User, username=username)
+    author = get_or_404('user', username)
     Follow.objects.filter(user=request.user, author=author).delete()
     return redirect('posts:profile', username=username)
@@ -37,10 +37,15 @@ LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
-# EmailBackend
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# EmailBackend: письма копятся в очереди, воркеры отправляют их
+# через EMAIL_DELIVERY_BACKEND (manage.py send_queued_mail)
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# Адрес сайта для ссылок в письмах
+SITE_URL = 'http://127.0.0.1:8000'
+
 
 # Application definition
 
@@ -59,6 +64,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.surrogate.SurrogateMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -76,12 +82,14 @@ TEMPLATES = [
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
+            # debug не подключён: без INTERNAL_IPS он ничего не добавляет.
+            # Свои процессоры ленивые, см. core.context_processors.lazy.
             'context_processors': [
-                'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.viewer.viewer',
             ],
         },
     },
@@ -143,14 +151,106 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static')
 ]
 
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+# Страницы, которые меняются только при выкладке: manage.py prerender_pages
+PRERENDER_ROOT = os.path.join(BASE_DIR, 'prerendered')
+
+# Без DEBUG статика собирается с хэшами в именах и заранее сжимается
+if not DEBUG:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
 MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
+# LocMemCache у каждого процесса свой. Если воркеров несколько, нужен
+# общий кэш (memcached, redis): на нём держатся события о новых постах,
+# рейтинг популярного, ограничение частоты и блокировки core.locks
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
+
+# Счётчик просмотров постов: сброс в базу пачками
+POST_VIEWS_FLUSH_THRESHOLD = 100
+POST_VIEWS_FLUSH_INTERVAL = 10
+POST_VIEWS_BACKGROUND_FLUSH = not DEBUG
+
+# Буферизованный приём комментариев: запись пачками через bulk_create
+COMMENTS_BUFFERED = False
+COMMENTS_FLUSH_THRESHOLD = 50
+COMMENTS_FLUSH_INTERVAL = 0.5
+COMMENTS_BACKGROUND_FLUSH = not DEBUG
+
+# Число постов в больших лентах берётся из кэша и пересчитывается в фоне
+POST_COUNT_BACKGROUND_REFRESH = not DEBUG
+
+# Прогрев следующей страницы ленты: не больше N прогревов одновременно
+FEED_PREFETCH_ENABLED = not DEBUG
+FEED_PREFETCH_WORKERS = 2
+FEED_PREFETCH_BACKGROUND = not DEBUG
+
+# CDN: анонимные страницы хранятся на краю и сбрасываются по ключам,
+# браузер их каждый раз перепроверяет.
+# Без SURROGATE_PURGE_URL запросы на сброс не отправляются
+EDGE_CACHE_TIMEOUT = 60 * 60 * 24
+SURROGATE_KEY_HEADER = 'Surrogate-Key'
+SURROGATE_PURGE_URL = None
+SURROGATE_PURGE_BATCH = 256
+SURROGATE_PURGE_DELAY = 2
+SURROGATE_PURGE_MAX_DELAY = 10
+SURROGATE_PURGE_TIMEOUT = 5
+SURROGATE_PURGE_BACKGROUND = not DEBUG
+
+# Блоки страниц, зависящие от пользователя: 'inline' — рендер на месте,
+# 'esi' — <esi:include> для Varnish/CDN, 'js' — загрузка скриптом.
+# Вне режима 'inline' тела лент и профиля одни для всех пользователей
+FRAGMENTS_MODE = 'inline'
+FRAGMENTS = {
+    'header': 'includes/header.html',
+    'switcher': 'posts/includes/switcher.html',
+    'post_controls': 'posts/includes/post_controls.html',
+    'follow_button': 'posts/includes/follow_button.html',
+}
+
+# Копии картинок по адресам /img/: пул воркеров и кэш на диске
+IMAGE_CACHE_ROOT = os.path.join(BASE_DIR, 'image_cache')
+IMAGE_CACHE_MAX_SIZE = 512 * 1024 * 1024
+IMAGE_WORKERS = 4
+IMAGE_MAX_PENDING = 32
+IMAGE_RESIZE_TIMEOUT = 10
+
+# События о новых постах: номера общие для всех воркеров через кэш.
+# 0 — короткий опрос: ответ сразу закрывается, браузер переподключается.
+# Больше 0 — поток держится столько секунд, нужны воркеры gthread/gevent
+POST_EVENTS_BACKEND = 'posts.events.CacheBackend'
+POST_EVENTS_STREAM_DURATION = 0
+
+# Ограничение частоты запросов: не больше N запросов за секунду (s),
+# минуту (m), час (h) или сутки (d) с одного IP и от одного пользователя
+RATELIMIT_ENABLED = True
+RATELIMITS = {
+    'posts:post_create': '10/m',
+    'posts:add_comment': '20/m',
+    'posts:profile_follow': '30/m',
+    'users:signup': '5/h',
+}
+
+# Посты старше стольких дней переносятся в архив (manage.py archive_posts)
+POSTS_ARCHIVE_AFTER_DAYS = 365
+
+# Страницы ошибок: анонимам без сессии — отрендеренные заранее.
+# Статистика адресов 404: manage.py not_found_stats
+ERROR_PAGES_PRERENDERED = not DEBUG
+ERROR_TRACKED_PATHS = 500
+ERROR_STATS_FLUSH_INTERVAL = 10
+ERROR_STATS_BACKGROUND_FLUSH = not DEBUG
+
+# Кэш поиска автора, группы и поста по адресу: сколько секунд помнить
+# найденную запись и то, что записи нет (0 — не помнить)
+LOOKUP_HIT_TIMEOUT = 60 * 5
+LOOKUP_MISS_TIMEOUT = 30
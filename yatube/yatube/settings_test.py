@@ -0,0 +1,18 @@
+"""Настройки для тестов: pytest.ini и manage.py test --settings.
+
+Медиа хранятся в памяти, пароли хэшируются быстрым хэшером, а у
+каждого процесса pytest-xdist свой каталог MEDIA_ROOT (базы разделяет
+сам pytest-django).
+"""
+import os
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+
+DEFAULT_FILE_STORAGE = 'core.storage.InMemoryStorage'
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+MEDIA_ROOT = os.path.join(
+    tempfile.gettempdir(),
+    'yatube-media-' + os.environ.get('PYTEST_XDIST_WORKER', 'main')
+)
+IMAGE_CACHE_ROOT = os.path.join(MEDIA_ROOT, 'image_cache')
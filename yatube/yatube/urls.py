@@ -18,16 +18,25 @@ from django.urls import include, path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.views import fragment, resized_image
+
 urlpatterns = [
     path('', include('posts.urls', namespace='posts')),
     path('admin/', admin.site.urls),
     path('auth/', include('users.urls')),
     path('auth/', include('django.contrib.auth.urls')),
     path('about/', include('about.urls', namespace='about')),
+    path('fragments/<str:name>/', fragment, name='fragment'),
+    path(
+        'img/<str:signature>/<int:width>x<int:height>/<str:extension>/'
+        '<path:name>',
+        resized_image,
+        name='resized_image'
+    ),
     path('group/<slug:slug>/', include('posts.urls', namespace='posts')),
 ]
 
-handler403 = 'core.csrf_failure'
+handler403 = 'core.views.permission_denied'
 handler404 = 'core.views.page_not_found'
 
 if settings.DEBUG:
@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+from core.prerender import PrerenderedPagesApplication  # noqa: E402
+from core.static import StaticFilesApplication  # noqa: E402
+
+application = StaticFilesApplication(
+    PrerenderedPagesApplication(application)
+)